@@ -0,0 +1,204 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul stellt die Klasse 'ActiveEdges' bereit, die beim Rotational Plane Sweep die von der Sweep-Linie
+geschnittenen Kanten nach ihrer Entfernung zum Ursprung sortiert speichert, sodass für jeden Test auf Sichtbarkeit nur
+die nächste Kante geprüft werden muss (Algorithmus von Lee).
+"""
+import math
+
+from geometry import *
+
+
+class ActiveEdges:
+    """
+    Stores all edges which are crossed by the rotating sweep line of one origin in a blocked sorted list (a list of
+    short sorted lists, like 'sortedcontainers.SortedList'), ordered by the distance between the origin and the
+    intersection of the sweep line with the edge. An edge is inserted with O(log k) comparisons (binary search over the
+    first edges of the blocks, then in one block) and removed in O(1) comparisons (every edge knows its block), both
+    move at most 'BLOCK_SIZE' references in one block. k is the number of active edges.
+    The order of two edges only stays valid while the sweep line rotates if the edges do not cross each other, which is
+    always true for the edges of polygons which do not overlap.
+    New edges are only inserted when the nearest edge is needed, so an edge which is added and removed again between
+    two queries is never compared with the other edges.
+    """
+    BLOCK_SIZE = 64  # a block is split when it has twice this many edges
+
+    def __init__(self, origin: Point):
+        """
+        Creates an empty list of active edges for the sweep around 'origin'.
+        :param origin: origin of the rotational plane sweep
+        """
+        self.origin = origin
+        self.ray_point = None  # the sweep line goes from 'origin' through 'ray_point'
+        self._blocks = []  # sorted, non-empty lists of inserted edges, the nearest edge is self._blocks[0][0]
+        self._block_of = {}  # inserted edge -> the block which contains it
+        self._pending = {}  # added edges which are not inserted yet (a dict keeps the order of addition)
+
+    def __len__(self):
+        return len(self._block_of) + len(self._pending)
+
+    def __contains__(self, edge) -> bool:
+        return edge in self._block_of or edge in self._pending
+
+    def __iter__(self):
+        self._insert_pending()
+        return (edge for block in self._blocks for edge in block)
+
+    def nearest(self):
+        """
+        Returns the edge which is the nearest to the origin on the current sweep line.
+        :return: an edge or None if there are no active edges
+        """
+        if self._pending:
+            self._insert_pending()
+        return self._blocks[0][0] if self._blocks else None
+
+    def in_front(self):
+        """
+        Yields the edges which intersect the current sweep line between the origin and 'ray_point', the nearest one
+        first. Usually only the first edge is needed: it hides 'ray_point' unless it only touches the sweep line (e.g.
+        with an end point on it), then the following edges have to be tested as well.
+        """
+        if self._pending:
+            self._insert_pending()
+        for block in self._blocks:
+            for edge in block:
+                if self._distance(edge) > 1 + 1e-09:  # 'ray_point' has the distance 1
+                    return
+                yield edge
+
+    def toggle(self, edges):
+        """
+        Removes all the given edges which are active and adds all the others (like 'set.symmetric_difference_update').
+        :param edges: iterable of edges
+        """
+        for edge in edges:
+            if edge in self._pending or edge in self._block_of:
+                self.remove(edge)
+            else:
+                self.add(edge)
+
+    def add(self, edge):
+        self._pending[edge] = None
+
+    def remove(self, edge):
+        if edge in self._pending:
+            del self._pending[edge]
+            return
+        block = self._block_of.pop(edge)
+        block.remove(edge)  # LineSegments are compared by identity
+        if not block:
+            blocks = self._blocks
+            del blocks[next(i for i in range(len(blocks)) if blocks[i] is block)]
+
+    def _insert_pending(self):
+        """
+        Inserts all pending edges relative to the current sweep line, which must be set with 'ActiveEdges.ray_point'
+        before.
+        """
+        origin_x, origin_y = self.origin.x, self.origin.y
+        dx = self.ray_point.x - origin_x
+        dy = self.ray_point.y - origin_y
+        blocks = self._blocks
+        block_of = self._block_of
+
+        def is_before(other) -> bool:
+            # True if 'other' is nearer to the origin than 'edge' (inlined 'ActiveEdges._distance')
+            p1, p2 = other.p1, other.p2
+            ex = p2.x - p1.x
+            ey = p2.y - p1.y
+            div = dx * ey - dy * ex
+            if div == 0:
+                difference = self._distance(other) - distance
+            else:
+                difference = ((p1.x - origin_x) * ey - (p1.y - origin_y) * ex) / div - distance
+            if difference < -tolerance:
+                return True
+            return difference <= tolerance and self._is_nearer(other, edge)
+
+        for edge in self._pending:
+            if not blocks:
+                blocks.append([edge])
+                block_of[edge] = blocks[0]
+                continue
+            distance = self._distance(edge)
+            tolerance = 1e-09 * abs(distance)  # like 'math.isclose'
+            # the last block whose first edge is nearer than 'edge' (or the first block)
+            low, high = 1, len(blocks)
+            while low < high:
+                middle = (low + high) // 2
+                if is_before(blocks[middle][0]):
+                    low = middle + 1
+                else:
+                    high = middle
+            block_index = low - 1
+            block = blocks[block_index]
+            low, high = 0, len(block)
+            while low < high:
+                middle = (low + high) // 2
+                if is_before(block[middle]):
+                    low = middle + 1
+                else:
+                    high = middle
+            block.insert(low, edge)
+            block_of[edge] = block
+            if len(block) >= 2 * self.BLOCK_SIZE:
+                second = block[self.BLOCK_SIZE:]
+                del block[self.BLOCK_SIZE:]
+                blocks.insert(block_index + 1, second)
+                for other in second:
+                    block_of[other] = second
+        self._pending.clear()
+
+    def _distance(self, edge) -> float:
+        """
+        Calculates the position of the intersection of the (unlimited) sweep line with the edge as a multiple of the
+        distance between 'origin' and 'ray_point'.
+        """
+        dx = self.ray_point.x - self.origin.x
+        dy = self.ray_point.y - self.origin.y
+        ex = edge.p2.x - edge.p1.x
+        ey = edge.p2.y - edge.p1.y
+        div = dx * ey - dy * ex
+        if div == 0:
+            # the edge is parallel to the sweep line, so the nearer end point is used
+            length = dx * dx + dy * dy
+            return min(((edge.p1.x - self.origin.x) * dx + (edge.p1.y - self.origin.y) * dy) / length,
+                       ((edge.p2.x - self.origin.x) * dx + (edge.p2.y - self.origin.y) * dy) / length)
+        return ((edge.p1.x - self.origin.x) * ey - (edge.p1.y - self.origin.y) * ex) / div
+
+    def _is_nearer(self, edge1, edge2) -> bool:
+        """
+        Returns True if 'edge1' is nearer to the origin than 'edge2' on the current sweep line.
+        If both edges have the same distance because they share an end point, the edge whose other end point is
+        nearer to the origin (seen from the shared point) is nearer after the sweep line rotated a bit further.
+        """
+        distance1 = self._distance(edge1)
+        distance2 = self._distance(edge2)
+        if not math.isclose(distance1, distance2):
+            return distance1 < distance2
+        if edge1.p1 is edge2.p1 or edge1.p1 is edge2.p2:
+            shared = edge1.p1
+        elif edge1.p2 is edge2.p1 or edge1.p2 is edge2.p2:
+            shared = edge1.p2
+        else:
+            return distance1 < distance2
+        other1 = edge1.p2 if edge1.p1 is shared else edge1.p1
+        other2 = edge2.p2 if edge2.p1 is shared else edge2.p1
+        return _angle_at(shared, self.origin, other1) < _angle_at(shared, self.origin, other2)
+
+
+def _angle_at(vertex: Point, point1: Point, point2: Point) -> float:
+    """
+    Calculates the angle (in rad, between 0 and pi) at 'vertex' between the lines to 'point1' and 'point2'.
+    """
+    angle = abs(math.atan2(point1.y - vertex.y, point1.x - vertex.x) -
+                math.atan2(point2.y - vertex.y, point2.x - vertex.x))
+    return 2*math.pi - angle if angle > math.pi else angle
@@ -0,0 +1,77 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul sortiert Nodes nach ihrem Winkel um einen Ursprung, so wie es der Rotational Plane Sweep braucht.
+'AngularSorter' sortiert für viele Ursprünge nacheinander und beginnt dabei immer mit der Reihenfolge des vorherigen
+Ursprungs. Benachbarte Ursprünge (z.B. die Ecken eines Polygons) haben fast dieselbe Reihenfolge, sodass Timsort nur
+wenige Vergleiche braucht.
+"""
+import bisect
+import math
+from array import array
+from typing import List
+
+from geometry import *
+
+
+def _sort_key(origin: Point, point: Point, index: int) -> tuple:
+    """
+    Sort key of 'point' around 'origin': the angle like 'LineSegment.angle', then the distance (squared) and then the
+    index, so that Nodes on the same position keep their order like in a stable sort.
+    """
+    dx = point.x - origin.x
+    dy = point.y - origin.y
+    return math.atan2(dx, dy) + math.pi, dx * dx + dy * dy, index
+
+
+def sort_by_angle(origin: Node, nodes: List[Node]) -> List[Node]:
+    """
+    Sorts all Nodes except 'origin' by their angle around 'origin' (if equal, by their distance).
+    :return: sorted list of Nodes
+    """
+    keys = [_sort_key(origin, node, i) for i, node in enumerate(nodes)]
+    return [nodes[i] for i in sorted(range(len(nodes)), key=keys.__getitem__) if nodes[i] is not origin]
+
+
+class AngularSorter:
+    """
+    Sorts the same Nodes around many origins. The order of the last origin is kept and sorted again for the next one.
+    """
+
+    def __init__(self, nodes: List[Node]):
+        """
+        :param nodes: all Nodes which are sorted
+        """
+        self.nodes = nodes
+        self.xs = array("d", (node.x for node in nodes))
+        self.ys = array("d", (node.y for node in nodes))
+        self._order = list(range(len(nodes)))
+
+    def sort(self, origin: Node, extra: Node = None) -> List[Node]:
+        """
+        Sorts all Nodes except 'origin' by their angle around 'origin' (like 'sort_by_angle').
+        :param origin: origin of the rotational plane sweep
+        :param extra: Optional. A Node which is not contained in 'nodes' (e.g. the Node on the y-axis), it is inserted
+        as if it was the last Node of 'nodes'
+        :return: sorted list of Nodes
+        """
+        origin_x, origin_y = origin.x, origin.y
+        atan2, pi = math.atan2, math.pi
+        keys = []
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            dx = x - origin_x
+            dy = y - origin_y
+            keys.append((atan2(dx, dy) + pi, dx * dx + dy * dy, i))
+        self._order.sort(key=keys.__getitem__)
+        nodes = self.nodes
+        result = [nodes[i] for i in self._order]
+        if extra is not None:
+            sorted_keys = [keys[i] for i in self._order]
+            result.insert(bisect.bisect(sorted_keys, _sort_key(origin, extra, len(nodes))), extra)
+        return [node for node in result if node is not origin]
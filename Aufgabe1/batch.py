@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Skript berechnet Lisas Weg für viele Dateien (alle .txt-Dateien eines Ordners oder ein Glob-Muster) in mehreren
+Prozessen. Für jede Datei wird eine Zeile im JSON-Lines-Format ausgegeben (Weg, Startzeit, Weglänge, Laufzeiten). Ein
+Fehler in einer Datei wird ebenfalls als Zeile ausgegeben und hält die anderen Dateien nicht auf. Stirbt ein Prozess,
+werden die noch nicht fertigen Dateien in neuen Prozessen erneut berechnet.
+
+Aufruf: batch.py QUELLE [-o AUSGABE] [-w PROZESSE] [--cache ORDNER] [--engine heap|list|astar] [--instrument]
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+
+from geometry import to_number
+from way_searcher import WaySearcher
+
+
+def find_files(source: str) -> List[str]:
+    """
+    :param source: a directory (all .txt files in it are used) or a glob pattern
+    :return: sorted list of file names
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.txt")
+    return sorted(glob.glob(source))
+
+
+def solve_file(filename: str, cache_dir: str = None, engine: str = "heap", instrument: bool = False) -> dict:
+    """
+    Searches Lisa's way for one file. Exceptions are caught and returned as part of the record.
+    :param instrument: Optional. If True, the counters of 'WaySearcher.enable_instrumentation' are added to the record
+    :return: record for the JSON Lines output
+    """
+    record = {"file": filename}
+    try:
+        t1 = time.perf_counter()
+        searcher = WaySearcher.from_file(filename)
+        t2 = time.perf_counter()
+        if instrument:
+            searcher.enable_instrumentation()
+        searcher.create_visibility_graph(cache_dir=cache_dir)
+        t3 = time.perf_counter()
+        way, way_length, way_time = searcher.dijkstra(engine)
+        t4 = time.perf_counter()
+    except Exception as e:
+        record.update(ok=False, error="{}: {}".format(type(e).__name__, e), traceback=traceback.format_exc())
+        return record
+    found = way[0].last_time != -math.inf
+    record.update(
+        ok=True,
+        found=found,
+        # seconds relative to 7:30, negative if Lisa has to start earlier
+        start_time=way[0].last_time if found else None,
+        bus_time=way[-1].y / searcher.bus_speed if found else None,
+        length=way_length,
+        duration=way_time,
+        way=[[to_number(node.x), to_number(node.y), node.polygon_id] for node in way],
+        timings={"parse": t2 - t1, "visibility_graph": t3 - t2, "search": t4 - t3, "total": t4 - t1}
+    )
+    if instrument:
+        record["instrumentation"] = searcher.instrumentation.to_dict()
+    return record
+
+
+def run(files: List[str], output, workers: int = None, cache_dir: str = None, engine: str = "heap",
+        instrument: bool = False) -> int:
+    """
+    Solves all files in a process pool and writes one JSON line for every file to 'output' as soon as it is solved
+    (so the order of the lines can differ from 'files').
+    If a worker process dies (e.g. it is killed because it needs too much memory), the pool breaks and all files which
+    were not finished are solved again in a new pool. A file which was unfinished in two broken pools is solved alone
+    in its own process, and if this process dies as well, an error is written for this file only.
+    :return: number of files which could not be solved
+    """
+    if cache_dir is not None and engine != "heap":
+        raise ValueError("Cached visibility graphs are compact and can only be searched with the engine 'heap'")
+    failed = 0
+
+    def write(record):
+        nonlocal failed
+        if not record["ok"]:
+            failed += 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    arguments = (cache_dir, engine, instrument)
+    breaks = {filename: 0 for filename in files}  # number of broken pools in which the file was not finished
+    pending = list(files)
+    while pending:
+        shared = [filename for filename in pending if breaks[filename] < 2]
+        alone = [filename for filename in pending if breaks[filename] >= 2]
+        pending = _solve_in_pool(shared, workers, arguments, write) if shared else []
+        for filename in pending:
+            breaks[filename] += 1
+        for filename in alone:
+            if _solve_in_pool([filename], 1, arguments, write):
+                write({"file": filename, "ok": False, "error": "worker process died"})
+    return failed
+
+
+def _solve_in_pool(files: List[str], workers: int, arguments: tuple, write) -> List[str]:
+    """
+    Solves the files in a new process pool and calls 'write' with the record of every file.
+    :return: the files which were not finished because the pool broke (no record is written for them)
+    """
+    unfinished = []
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = {executor.submit(solve_file, filename, *arguments): filename for filename in files}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                unfinished.append(futures[future])
+                continue
+            except Exception as e:
+                # the task itself failed outside of 'solve_file' (e.g. the result could not be transferred)
+                record = {"file": futures[future], "ok": False, "error": "{}: {}".format(type(e).__name__, e)}
+            write(record)
+    return unfinished
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Searches Lisa's way for many files and writes JSON Lines.")
+    parser.add_argument("source", help="directory (all .txt files) or glob pattern")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' (standard) for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes (standard: all CPUs)")
+    parser.add_argument("--cache", default=None, help="directory for cached visibility graphs")
+    parser.add_argument("--engine", default="heap", choices=("heap", "list", "astar"), help="search engine")
+    parser.add_argument("--instrument", action="store_true", help="add counters and timings of every phase")
+    args = parser.parse_args()
+    if args.cache is not None and args.engine != "heap":
+        parser.error("--cache can only be used with --engine heap (cached graphs are compact)")
+
+    files = find_files(args.source)
+    if not files:
+        print("Keine Dateien gefunden: '{}'".format(args.source), file=sys.stderr)
+        sys.exit(2)
+    if args.output == "-":
+        failed = run(files, sys.stdout, args.workers, args.cache, args.engine, args.instrument)
+    else:
+        with open(args.output, "w") as f:
+            failed = run(files, f, args.workers, args.cache, args.engine, args.instrument)
+    print("{} von {} Dateien bearbeitet, {} Fehler".format(len(files) - failed, len(files), failed), file=sys.stderr)
+    sys.exit(1 if failed else 0)
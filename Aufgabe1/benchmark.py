@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Skript misst die Laufzeiten der einzelnen Schritte (Einlesen, Sichtbarkeitsgraph, Suche, SVG) auf zufälligen
+Karten ('map_generator') mit 10 bis 100000 Ecken. Große Karten verwenden den Lazy-Sichtbarkeitsgraphen, damit die
+Sweeps trotzdem gemessen werden, wird für jede Größe eine feste Stichprobe vollständiger Rotational Plane Sweeps
+gemessen und daraus die Laufzeit des vollständigen Graphen geschätzt. Die Karten hängen nur von Größe und Seed ab, die
+Ergebnisse werden als JSON Lines mit festen Schlüsseln gespeichert, sodass Messungen verschiedener Commits verglichen
+werden können ('--compare ALT NEU').
+
+Aufruf: benchmark.py [--sizes N ...] [--repeat N] [--full-limit N] [--search-limit N] [--sweep-sample N] [-o DATEI]
+        benchmark.py --compare ALT NEU
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from angular_sort import AngularSorter
+from map_generator import generate_map
+from way_searcher import WaySearcher
+
+PHASES = ("parse", "visibility_graph", "lazy_setup", "sweep_sample", "search", "svg")
+AVERAGE_VERTICES = 5.5  # average number of vertices of an obstacle with the standard settings of 'generate_map'
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(size: int, seed: int = 0, full_limit: int = 2000, search_limit: int = 20000, sweep_sample: int = 10,
+             directory: str = None) -> dict:
+    """
+    Generates a map with about 'size' obstacle vertices and measures every phase once:
+    "parse": 'WaySearcher.from_file', "visibility_graph": the complete visibility graph (None above 'full_limit'),
+    "lazy_setup": the lines to the y-axis of the lazy visibility graph (None up to 'full_limit'), "sweep_sample":
+    complete rotational plane sweeps for 'sweep_sample' origins chosen with 'seed' (for all sizes, so that the cost of
+    a sweep can be compared across sizes), "search": Dijkstra on the complete graph or A* on the lazy graph including
+    its sweeps on demand (None above 'search_limit'), "svg": 'WaySearcher.save_svg'.
+    :param full_limit: maps with more vertices (after the expansion by Lisa's polygon) use the lazy visibility graph
+    and the A* search, because the complete graph needs O(n² log n)
+    :param search_limit: the search is skipped for maps with more vertices (its timing is None)
+    :param sweep_sample: number of origins whose sweeps are timed. The record contains the time per sweep and the time
+    of all sweeps of the complete visibility graph estimated from it.
+    :return: record with the timings of all phases in seconds
+    """
+    polygon_count = max(1, round(size / AVERAGE_VERTICES))
+    text = generate_map(polygon_count, lisa_polygon=3, seed=seed)
+    path = os.path.join(directory, "map{}.txt".format(size))
+    with open(path, "w") as f:
+        f.write(text)
+    timings = dict.fromkeys(PHASES)
+    t1 = time.perf_counter()
+    searcher = WaySearcher.from_file(path)
+    t2 = time.perf_counter()
+    timings["parse"] = t2 - t1
+    vertices = len(searcher.nodes) - 1
+    lazy = vertices > full_limit
+    searcher.create_visibility_graph(lazy=lazy)
+    t3 = time.perf_counter()
+    timings["lazy_setup" if lazy else "visibility_graph"] = t3 - t2
+    # complete sweeps for a fixed sample of origins, done like 'WaySearcher._sweep_sequential'
+    origins = [node for node in searcher._all_nodes if node in searcher._visible_targets]
+    sample = random.Random(seed).sample(origins, min(sweep_sample, len(origins)))
+    y_rotation_angle = math.degrees(math.asin(searcher.lisa_speed / searcher.bus_speed))
+    t3 = time.perf_counter()
+    sorter = AngularSorter(searcher._all_nodes)
+    for origin in sample:
+        searcher._rotational_plane_sweep(origin, sorter.sort(origin, origin.get_rotated_on_y_axis(y_rotation_angle)),
+                                         searcher._visible_targets, searcher._active_edges, presorted=True)
+    t4 = time.perf_counter()
+    timings["sweep_sample"] = t4 - t3
+    way, way_length = None, None
+    if vertices <= search_limit:
+        way, way_length, way_time = searcher.dijkstra("astar" if lazy else "heap")
+        timings["search"] = time.perf_counter() - t4
+    t5 = time.perf_counter()
+    searcher.save_svg(os.path.join(directory, "map{}.svg".format(size)), way)
+    timings["svg"] = time.perf_counter() - t5
+    mode = "lazy" if lazy else "full"
+    if way is not None:
+        mode += "+astar" if lazy else "+heap"
+    return _add_sweep_estimate({
+        "size": size,
+        "seed": seed,
+        "polygons": polygon_count,
+        "input_vertices": sum(len(polygon.original_points) for polygon in searcher.polygons),
+        "vertices": vertices,
+        "origins": len(origins),
+        "mode": mode,
+        "graph_lines": len(searcher.vis_graph_lines),
+        "expanded_nodes": searcher.expanded_nodes,
+        "length": round(way_length, 6) if way is not None else None,
+        "sweep_sample_size": len(sample),
+        "timings": timings
+    })
+
+
+def _add_sweep_estimate(record: dict) -> dict:
+    """
+    Adds the time per sweep ("sweep_time") and the time of all sweeps of the complete visibility graph estimated
+    from it ("visibility_graph_estimate") to a record of 'run_case'.
+    """
+    sweep_time = None
+    if record["sweep_sample_size"]:
+        sweep_time = record["timings"]["sweep_sample"] / record["sweep_sample_size"]
+    record["sweep_time"] = round(sweep_time, 6) if sweep_time is not None else None
+    record["visibility_graph_estimate"] = round(sweep_time * record["origins"], 3) if sweep_time is not None else None
+    return record
+
+
+def run(sizes: List[int], repeat: int = 1, seed: int = 0, full_limit: int = 2000, search_limit: int = 20000,
+        sweep_sample: int = 10, output=sys.stdout):
+    """
+    Runs all sizes and writes one JSON line for every size (the minimum of 'repeat' runs for every phase). The first
+    line describes the environment.
+    """
+    meta = {"commit": _git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+            "repeat": repeat}
+    output.write(json.dumps({"meta": meta}, sort_keys=True) + "\n")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            best = None
+            for _ in range(repeat):
+                record = run_case(size, seed, full_limit, search_limit, sweep_sample, directory)
+                if best is None:
+                    best = record
+                else:
+                    for phase in PHASES:
+                        if record["timings"][phase] is not None:
+                            best["timings"][phase] = min(best["timings"][phase], record["timings"][phase])
+            _add_sweep_estimate(best)
+            best["timings"] = {phase: round(t, 6) if t is not None else None for phase, t in best["timings"].items()}
+            output.write(json.dumps(best, sort_keys=True) + "\n")
+            output.flush()
+
+
+def load(path: str) -> Dict[int, dict]:
+    with open(path, "r") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return {record["size"]: record for record in records if "meta" not in record}
+
+
+def compare(old_path: str, new_path: str):
+    """
+    Prints the timings of two benchmark files side by side (new time / old time).
+    """
+    old, new = load(old_path), load(new_path)
+    print("{:>8} {:>18} {:>10} {:>10} {:>7}".format("size", "phase", "old", "new", "ratio"))
+    for size in sorted(set(old) & set(new)):
+        if old[size]["mode"] != new[size]["mode"] or old[size]["vertices"] != new[size]["vertices"]:
+            print("{:>8} different maps or modes, not comparable".format(size))
+            continue
+        for phase in PHASES:
+            t_old, t_new = old[size]["timings"].get(phase), new[size]["timings"].get(phase)
+            if t_old is None or t_new is None:
+                continue
+            print("{:>8} {:>18} {:>10.4f} {:>10.4f} {:>7}".format(
+                size, phase, t_old, t_new, "{:.2f}".format(t_new / t_old) if t_old else "-"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the phases of the way search on random maps.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="approximate numbers of obstacle vertices")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size, the fastest one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--full-limit", type=int, default=2000,
+                        help="larger maps use the lazy visibility graph and A*")
+    parser.add_argument("--search-limit", type=int, default=20000, help="the search is skipped for larger maps")
+    parser.add_argument("--sweep-sample", type=int, default=10,
+                        help="number of origins whose complete sweeps are timed for every size")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' (standard) for stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two benchmark files")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    elif args.output == "-":
+        run(args.sizes, args.repeat, args.seed, args.full_limit, args.search_limit, args.sweep_sample)
+    else:
+        with open(args.output, "w") as f:
+            run(args.sizes, args.repeat, args.seed, args.full_limit, args.search_limit, args.sweep_sample, f)
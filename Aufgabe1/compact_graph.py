@@ -0,0 +1,182 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul stellt die Klasse 'CompactGraph' bereit, die den Sichtbarkeitsgraphen platzsparend in Arrays speichert
+(Koordinaten, Kanten der Hindernisse und Nachbarn im CSR-Format) und darauf den Dijkstra-Algorithmus ausführt.
+Ein 'CompactGraph' kann in einer Binärdatei gespeichert und wieder geladen werden.
+"""
+import heapq
+import math
+import struct
+import sys
+from array import array
+from typing import List, Iterator, Tuple
+
+
+class CompactGraph:
+    """
+    Visibility graph stored as struct of arrays. Node i has the position (xs[i], ys[i]). The Nodes from which Node i
+    can be reached are targets[offsets[i]:offsets[i+1]] (compressed sparse row format), the corresponding distances are
+    stored in 'weights'. The obstacle edges are stored as pairs of Node indices in 'edge_nodes'.
+    """
+
+    def __init__(self, xs: array, ys: array, edge_nodes: array, offsets: array, targets: array, weights: array,
+                 start_times: array):
+        """
+        Creates a 'CompactGraph' from the given arrays.
+        :param xs: x-coordinates of all Nodes
+        :param ys: y-coordinates of all Nodes
+        :param edge_nodes: for every obstacle edge the indices of its two Nodes
+        :param offsets: CSR offsets (length: number of Nodes + 1)
+        :param targets: CSR column indices
+        :param weights: distance for every entry in 'targets'
+        :param start_times: initial 'last_time' of every Node (-inf for all Nodes which are not on the y-axis)
+        """
+        self.xs = xs
+        self.ys = ys
+        self.edge_nodes = edge_nodes
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.start_times = start_times
+
+    @staticmethod
+    def from_pairs(nodes, edges, pair_targets: array, pair_sources: array) -> "CompactGraph":
+        """
+        Creates a 'CompactGraph' from the position of the given Nodes and a list of visibility pairs.
+        :param nodes: list of all Nodes (index = position in this list)
+        :param edges: obstacle edges whose end points are contained in 'nodes'
+        :param pair_targets: for every pair the index of the Node which can be reached from the Node in 'pair_sources'
+        :param pair_sources: see 'pair_targets'
+        :return: new 'CompactGraph'
+        """
+        node_ids = {node: i for i, node in enumerate(nodes)}
+        xs = array("d", (node.x for node in nodes))
+        ys = array("d", (node.y for node in nodes))
+        edge_nodes = array("q")
+        for edge in edges:
+            edge_nodes.append(node_ids[edge.p1])
+            edge_nodes.append(node_ids[edge.p2])
+        # counting sort of the pairs by their target
+        offsets = array("q", [0]) * (len(nodes) + 1)
+        for target in pair_targets:
+            offsets[target + 1] += 1
+        for i in range(len(nodes)):
+            offsets[i + 1] += offsets[i]
+        position = array("q", offsets[:-1])
+        targets = array("q", [0]) * len(pair_targets)
+        weights = array("d", [0]) * len(pair_targets)
+        for target, source in zip(pair_targets, pair_sources):
+            targets[position[target]] = source
+            weights[position[target]] = math.sqrt((xs[target] - xs[source]) ** 2 + (ys[target] - ys[source]) ** 2)
+            position[target] += 1
+        start_times = array("d", (node.last_time for node in nodes))
+        return CompactGraph(xs, ys, edge_nodes, offsets, targets, weights, start_times)
+
+    FILE_MAGIC = b"VISGRAPH"
+    FILE_VERSION = 1
+    ARRAY_NAMES = ["xs", "ys", "edge_nodes", "offsets", "targets", "weights", "start_times"]
+
+    def save(self, path: str):
+        """
+        Saves all arrays in a binary file. The header contains the byte order, so that files are not loaded on machines
+        with a different one.
+        :param path: path to the file
+        """
+        with open(path, "wb") as f:
+            f.write(self.FILE_MAGIC)
+            f.write(struct.pack("<HB", self.FILE_VERSION, sys.byteorder == "little"))
+            for name in self.ARRAY_NAMES:
+                values = getattr(self, name)
+                f.write(struct.pack("<cQ", values.typecode.encode(), len(values)))
+                values.tofile(f)
+
+    @staticmethod
+    def load(path: str) -> "CompactGraph":
+        """
+        Loads a 'CompactGraph' saved by 'CompactGraph.save'.
+        :param path: path to the file
+        :return: the loaded 'CompactGraph'
+        :raises ValueError: if the file is no valid graph file or was saved with a different byte order
+        """
+        with open(path, "rb") as f:
+            if f.read(len(CompactGraph.FILE_MAGIC)) != CompactGraph.FILE_MAGIC:
+                raise ValueError("'{}' is not a visibility graph file".format(path))
+            version, little_endian = struct.unpack("<HB", f.read(3))
+            if version != CompactGraph.FILE_VERSION or bool(little_endian) != (sys.byteorder == "little"):
+                raise ValueError("'{}' was saved with a different version or byte order".format(path))
+            arrays = []
+            for _ in CompactGraph.ARRAY_NAMES:
+                typecode, length = struct.unpack("<cQ", f.read(9))
+                values = array(typecode.decode())
+                values.fromfile(f, length)
+                arrays.append(values)
+        return CompactGraph(*arrays)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def neighbors(self, node_id: int) -> array:
+        """
+        Returns the indices of the Nodes from which 'node_id' can be reached.
+        """
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def segments(self) -> Iterator[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """
+        Yields the two positions of every line in the visibility graph (used for the svg graphic).
+        """
+        xs, ys, offsets, targets = self.xs, self.ys, self.offsets, self.targets
+        for node_id in range(len(xs)):
+            for k in range(offsets[node_id], offsets[node_id + 1]):
+                yield (xs[targets[k]], ys[targets[k]]), (xs[node_id], ys[node_id])
+
+    def dijkstra(self, goal: int, speed: float) -> Tuple[array, array]:
+        """
+        Searches the latest time to leave every Node (at most until 'goal' is chosen) with a binary heap, exactly like
+        'WaySearcher.dijkstra'.
+        :param goal: index of Lisa's house
+        :param speed: Lisa's speed in meters per second
+        :return: times ('last_time' of every Node) and parents (index of the next Node on the way or -1)
+        """
+        times = array("d", self.start_times)
+        parents = array("q", [-1]) * len(times)
+        visited = bytearray(len(times))
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        heap = [(-time, i) for i, time in enumerate(times) if time != -math.inf]
+        heapq.heapify(heap)
+        while heap:
+            negative_time, node_id = heapq.heappop(heap)
+            if visited[node_id] or -negative_time != times[node_id]:
+                continue  # outdated entry (lazy decrease-key)
+            if node_id == goal:
+                break
+            visited[node_id] = 1
+            time = times[node_id]
+            for k in range(offsets[node_id], offsets[node_id + 1]):
+                neighbor_id = targets[k]
+                if not visited[neighbor_id]:
+                    new_time = time - weights[k] / speed
+                    if new_time > times[neighbor_id]:
+                        times[neighbor_id] = new_time
+                        parents[neighbor_id] = node_id
+                        heapq.heappush(heap, (-new_time, neighbor_id))
+        return times, parents
+
+
+def get_way_ids(parents: array, start: int) -> List[int]:
+    """
+    Follows the parents from 'start' and returns all Node indices on the way.
+    """
+    way = []
+    node_id = start
+    while node_id != -1:
+        way.append(node_id)
+        node_id = parents[node_id]
+    return way
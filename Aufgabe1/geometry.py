@@ -10,9 +10,14 @@ WRITTEN IN PYTHON3
 Dieses Modul stellt alle Klassen bereit, die nötig sind, um Punkte, Nodes oder Lines (Strecken bzw. Kanten)
 darzustellen und Berechnungen (Distanz, Schnittpunkt usw.) anzustellen.
 """
+import bisect
 import math
+from array import array
+from fractions import Fraction
 from typing import List
 
+from minkowski import minkowski_sum, polygon_union, polygons_overlap, signed_area
+
 
 class Point:
     """
@@ -61,10 +66,15 @@ class Point:
         :param other: Point (or Node) to compare with
         :return: bool (True -> same position, False -> different position)
         """
+        if is_exact(self) and is_exact(other):
+            return self.x == other.x and self.y == other.y
         return math.isclose(self.x, other.x) and math.isclose(self.y, other.y)
 
 
 class Node(Point):
+    __slots__ = ["last_time", "neighbors", "polygon_neighbors", "edges", "parent", "polygon", "polygon_id", "swept",
+                 "convex"]
+
     def __init__(self, x: float, y: float,
                  neighbors: List["Node"] = None, edges: List["Edge"] = None, polygon_id=None):
         """
@@ -95,6 +105,8 @@ class Node(Point):
         self.parent = None
         self.polygon = None
         self.polygon_id = polygon_id
+        self.swept = False  # True when 'neighbors' contains the result of a (lazy) rotational plane sweep
+        self.convex = True  # False if this Node is a reflex vertex of its polygon (see 'Polygon.classify_vertices')
 
     def __repr__(self):
         return "Node({x:.2f}|{y:.2f})".format(x=self.x, y=self.y)
@@ -128,6 +140,7 @@ class LineSegment:
     """
     Represents a line segment from 'LineSegment.p1' to 'LineSegment.p2'
     """
+    __slots__ = ["p1", "p2", "length", "angle", "exact"]
 
     def __init__(self, point1: Point, point2: Point):
         """
@@ -141,6 +154,7 @@ class LineSegment:
         self.length = self.p1.get_distance(self.p2)
         self.angle = (math.atan2(self.p2.x - self.p1.x, self.p2.y - self.p1.y) + math.pi)  # line down is 0 rad, to
                                                                                            # left is 1/2pi rad, ...
+        self.exact = is_exact(point1) and is_exact(point2)  # True if the predicates can be calculated with integers
 
     def __repr__(self):
         return "Segment({p1},{p2})".format(p1=self.p1, p2=self.p2)
@@ -159,6 +173,8 @@ class LineSegment:
 
 
 class Edge(LineSegment):
+    __slots__ = []
+
     def __init__(self, point1: Node, point2: Node):
         """
         An 'Edge' is similar to 'LineSegment', but the resulting segment between the two Nodes is added automatically
@@ -174,8 +190,194 @@ class Edge(LineSegment):
         self.p2.polygon_neighbors.append(self.p1)
 
 
+class EdgeGrid:
+    """
+    Uniform grid over line segments. Every segment is stored in all cells it touches, so that a query only has to test
+    the segments in the cells touched by the query segment.
+    """
+
+    def __init__(self, edges: List[LineSegment], cell_size: float = None):
+        """
+        Creates the grid and inserts all 'edges'.
+        :param edges: the segments to index
+        :param cell_size: Optional. Side length of one cell. Standard: the average length of the edges.
+        """
+        if cell_size is None:
+            cell_size = sum(edge.length for edge in edges) / len(edges) if edges else 1
+        self.cell_size = cell_size if cell_size > 0 else 1
+        self.edges = edges
+        self.cells = {}  # (column, row) -> list of indices in 'edges'
+        for i, edge in enumerate(edges):
+            for cell in self._get_cells(edge.p1.x, edge.p1.y, edge.p2.x, edge.p2.y):
+                self.cells.setdefault(cell, []).append(i)
+
+    def _get_cells(self, x1: float, y1: float, x2: float, y2: float):
+        """
+        Yields all cells (column, row) which are touched by the segment from (x1|y1) to (x2|y2).
+        """
+        size = self.cell_size
+        epsilon = size * 1e-9  # cells are extended a bit, so that points on the border of cells are found
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        dx = x2 - x1
+        dy = y2 - y1
+        for column in range(math.floor((x1 - epsilon) / size), math.floor((x2 + epsilon) / size) + 1):
+            if dx == 0:
+                low, high = y1, y2
+            else:
+                # the part of the segment inside this column
+                column_x1 = max(x1, column * size)
+                column_x2 = min(x2, (column + 1) * size)
+                low = y1 + (column_x1 - x1) / dx * dy
+                high = y1 + (column_x2 - x1) / dx * dy
+            if low > high:
+                low, high = high, low
+            for row in range(math.floor((low - epsilon) / size), math.floor((high + epsilon) / size) + 1):
+                yield column, row
+
+    def query_indices(self, line: LineSegment) -> set:
+        """
+        Returns the indices of all edges which are in a cell touched by 'line'. Every edge which intersects 'line' is
+        contained.
+        :param line: some 'LineSegment'
+        :return: set of indices in 'EdgeGrid.edges'
+        """
+        return self.query_coordinates(line.p1.x, line.p1.y, line.p2.x, line.p2.y)
+
+    def query_coordinates(self, x1: float, y1: float, x2: float, y2: float) -> set:
+        """
+        Like 'EdgeGrid.query_indices' for the segment from (x1|y1) to (x2|y2), without creating a 'LineSegment'.
+        """
+        indices = set()
+        for cell in self._get_cells(x1, y1, x2, y2):
+            cell_indices = self.cells.get(cell)
+            if cell_indices:
+                indices.update(cell_indices)
+        return indices
+
+    def query(self, line: LineSegment) -> set:
+        """
+        Like 'EdgeGrid.query_indices', but returns the edges themselves.
+        """
+        return {self.edges[i] for i in self.query_indices(line)}
+
+
+class EdgeArray:
+    """
+    Stores the coordinates of many edges in flat arrays, so that one segment can be intersected with many edges in one
+    call without creating any 'Point'.
+    """
+
+    def __init__(self, edges: List[LineSegment]):
+        self.edges = edges
+        # integer coordinates are stored as integers, so that 'EdgeArray.crossings' can use exact predicates
+        self.exact = all(edge.exact for edge in edges)
+        typecode = "q" if self.exact else "d"
+        self.x1 = array(typecode, (edge.p1.x for edge in edges))
+        self.y1 = array(typecode, (edge.p1.y for edge in edges))
+        self.x2 = array(typecode, (edge.p2.x for edge in edges))
+        self.y2 = array(typecode, (edge.p2.y for edge in edges))
+        # identities of the end points, because lines with a common end point do not intersect ('get_intersection')
+        self.id1 = [id(edge.p1) for edge in edges]
+        self.id2 = [id(edge.p2) for edge in edges]
+
+    def intersections(self, line: LineSegment, indices=None) -> List[tuple]:
+        """
+        Calculates the intersections of 'line' with the edges, exactly like 'get_intersection(line, edge)'.
+        :param line: some 'LineSegment'
+        :param indices: Optional. Only the edges with these indices are tested. Standard: all edges.
+        :return: list of tuples (index, x, y) for every edge which intersects 'line'
+        """
+        lx1, ly1, lx2, ly2 = line.p1.x, line.p1.y, line.p2.x, line.p2.y
+        line_ids = (id(line.p1), id(line.p2))
+        line_dx = lx1 - lx2
+        line_dy = ly1 - ly2
+        line_cross = lx1 * ly2 - ly1 * lx2
+        line_vertical = lx1 == lx2
+        x1, y1, x2, y2, id1, id2 = self.x1, self.y1, self.x2, self.y2, self.id1, self.id2
+        hits = []
+        for i in (range(len(x1)) if indices is None else indices):
+            if id1[i] in line_ids or id2[i] in line_ids:
+                continue
+            ex1, ey1, ex2, ey2 = x1[i], y1[i], x2[i], y2[i]
+            edge_dx = ex1 - ex2
+            edge_dy = ey1 - ey2
+            div = line_dx * edge_dy - edge_dx * line_dy
+            if div == 0:
+                continue
+            edge_cross = ex1 * ey2 - ey1 * ex2
+            x = (line_cross * edge_dx - edge_cross * line_dx) / div
+            y = (line_cross * edge_dy - edge_cross * line_dy) / div
+            # verify that the intersection is in range of both lines (see 'LineSegment.in_range')
+            if line_vertical:
+                if not (ly1 <= y <= ly2 or ly2 <= y <= ly1):
+                    continue
+            elif not (lx1 <= x <= lx2 or lx2 <= x <= lx1):
+                continue
+            if ex1 == ex2:
+                if not (ey1 <= y <= ey2 or ey2 <= y <= ey1):
+                    continue
+            elif not (ex1 <= x <= ex2 or ex2 <= x <= ex1):
+                continue
+            hits.append((i, x, y))
+        return hits
+
+    def crossings(self, line: LineSegment, indices=None) -> List[int]:
+        """
+        Returns the indices of all edges which intersect 'line' (like 'EdgeArray.intersections', but without the
+        intersection points). If all coordinates are integers, only exact orientation tests are used.
+        :param line: some 'LineSegment'
+        :param indices: Optional. Only the edges with these indices are tested. Standard: all edges.
+        :return: list of indices
+        """
+        if not (self.exact and line.exact):
+            return [i for i, _, _ in self.intersections(line, indices)]
+        ax, ay, bx, by = line.p1.x, line.p1.y, line.p2.x, line.p2.y
+        line_ids = (id(line.p1), id(line.p2))
+        rx = bx - ax
+        ry = by - ay
+        x1, y1, x2, y2, id1, id2 = self.x1, self.y1, self.x2, self.y2, self.id1, self.id2
+        hits = []
+        for i in (range(len(x1)) if indices is None else indices):
+            if id1[i] in line_ids or id2[i] in line_ids:
+                continue
+            cx, cy, dx, dy = x1[i], y1[i], x2[i], y2[i]
+            sx = dx - cx
+            sy = dy - cy
+            if rx * sy - ry * sx == 0:
+                continue  # parallel lines never intersect (see 'get_intersection')
+            # the end points of each segment must not lie (strictly) on the same side of the other segment
+            o1 = rx * (cy - ay) - ry * (cx - ax)
+            o2 = rx * (dy - ay) - ry * (dx - ax)
+            if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+                continue
+            o3 = sx * (ay - cy) - sy * (ax - cx)
+            o4 = sx * (by - cy) - sy * (bx - cx)
+            if (o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0):
+                continue
+            hits.append(i)
+        return hits
+
+
 class Polygon:
-    def __init__(self, vertices: List[Node], polygon_id=None, addition: List[Point] = None):
+    EDGE_GRID_MIN_EDGES = 32  # 'point_in_polygon' uses an 'EdgeGrid' for polygons with at least this many edges
+
+    def __init__(self, vertices: List[Node], polygon_id=None, addition: List[Point] = None, minkowski: str = "exact"):
+        """
+        Creates a polygon. If 'addition' is given, the polygon is expanded by Lisa's polygon, so that Lisa's polygon
+        does not overlap this polygon as long as her position is outside the expanded polygon.
+        :param vertices: vertices of the polygon
+        :param polygon_id: Optional. Identifier of the polygon
+        :param addition: Optional. Lisa's polygon relative to her position
+        :param minkowski: Optional. "exact" (standard): the Minkowski sum is calculated by 'minkowski.minkowski_sum'
+        (convex polygons are merged in linear time, the boundaries of non-convex ones are split into convex chains
+        which are added to Lisa's polygon and united). "sorted": the former method, all shifted vertices outside the
+        polygon are sorted by their angle around the midpoint (the result is not always a simple polygon).
+        """
+        self.polygon_id = polygon_id
+        self._edge_index = None  # (edges, EdgeGrid, EdgeArray), see 'Polygon._get_edge_index'
+        self._bounding_box = None  # (points, bounding box), see 'Polygon.bounding_box'
+        self.merged_polygons = []  # the polygons this polygon was merged from, see 'merge_overlapping_polygons'
         self.original_points = vertices
 
         self.points = vertices
@@ -184,7 +386,23 @@ class Polygon:
             node.polygon_id = polygon_id
         self.edges = [Edge(vertices[i], vertices[i-1]) for i in range(len(vertices))]
         self.small_polygons = []
-        if addition:
+        if addition and minkowski == "exact":
+            self.small_polygons = [[Node(vertex.x-point.x, vertex.y-point.y) for point in addition]
+                                   for vertex in vertices]
+            boundaries = minkowski_sum([(vertex.x, vertex.y) for vertex in vertices],
+                                       [(-point.x, -point.y) for point in addition])
+            # the sum of two connected polygons is connected, so there is only one boundary
+            boundary = max(boundaries, key=signed_area)
+            vertices = [Node(to_number(x), to_number(y)) for x, y in boundary]
+            self.edges = [Edge(vertices[i], vertices[i - 1]) for i in range(len(vertices))]
+            self.points = vertices
+            for node in self.points:
+                node.polygon = self
+                node.polygon_id = polygon_id
+            self.classify_vertices()
+        elif addition:
+            if minkowski != "sorted":
+                raise ValueError("unknown Minkowski sum method '{}'".format(minkowski))
             new_vertices = []
             for vertex in vertices:
                 addition_points = [Node(vertex.x-point.x, vertex.y-point.y) for point in addition]
@@ -218,46 +436,354 @@ class Polygon:
             for node in self.points:
                 node.polygon = self
                 node.polygon_id = polygon_id
+            # the vertices sorted by their angle around the midpoint do not always form a simple polygon, so they can
+            # not be classified and are all kept as convex
+        else:
+            self.classify_vertices()
 
     @staticmethod
-    def from_str(text: str, polygon_id=None, minkowski_add=None) -> "Polygon":
+    def from_str(text: str, polygon_id=None, minkowski_add=None, minkowski: str = "exact") -> "Polygon":
         numbers = text.strip().split(" ")
         number_count = int(numbers[0])
         assert len(numbers) == number_count * 2 + 1  # text should be "n x1 y1 x2 y2 ... xn yn"
         vertices = [Node(int(numbers[i]), int(numbers[i + 1])) for i in range(1, len(numbers), 2)]
-        return Polygon(vertices, polygon_id, minkowski_add)
+        return Polygon(vertices, polygon_id, minkowski_add, minkowski)
     
+    def classify_vertices(self):
+        """
+        Sets 'Node.convex' for every vertex of this polygon. A vertex is reflex (not convex) if the interior angle is
+        greater than 180°. Shortest ways never bend at reflex vertices. Vertices with an interior angle of exactly 180°
+        are treated as convex, because ways can lead along the edges through them.
+        """
+        count = len(self.points)
+        # twice the signed area, positive if the vertices are ordered counter-clockwise
+        area = sum(self.points[i-1].x * self.points[i].y - self.points[i].x * self.points[i-1].y
+                   for i in range(count))
+        for i, vertex in enumerate(self.points):
+            # skip vertices on the same position, they do not define a direction
+            previous = next((self.points[i - j] for j in range(1, count)
+                             if not self.points[i - j].has_same_point(vertex)), None)
+            following = next((self.points[(i + j) % count] for j in range(1, count)
+                              if not self.points[(i + j) % count].has_same_point(vertex)), None)
+            if previous is None or following is None:
+                vertex.convex = True
+                continue
+            cross = (vertex.x - previous.x) * (following.y - vertex.y) - (vertex.y - previous.y) * (following.x - vertex.x)
+            vertex.convex = cross * area >= 0
+
+    def get_bounding_box(self):
+        """
+        Calculates the axis-aligned bounding box of this polygon.
+        :return: tuple (min_x, min_y, max_x, max_y)
+        """
+        return (min(p.x for p in self.points), min(p.y for p in self.points),
+                max(p.x for p in self.points), max(p.y for p in self.points))
+
+    @property
+    def bounding_box(self):
+        """
+        Bounding box of this polygon (see 'Polygon.get_bounding_box'), calculated when it is needed the first time.
+        """
+        if self._bounding_box is None or self._bounding_box[0] is not self.points:
+            # the points are replaced when the polygon is expanded in the constructor
+            self._bounding_box = (self.points, self.get_bounding_box())
+        return self._bounding_box[1]
+
     def calc_midpoint(self):
         return Point(sum(p.x for p in self.points)/len(self.points), sum(p.y for p in self.points)/len(self.points))
 
-    def point_in_polygon(self, point: Point) -> bool:
+    @property
+    def edge_grid(self) -> EdgeGrid:
+        """
+        'EdgeGrid' over the edges of this polygon, created when it is needed the first time.
+        """
+        return self._get_edge_index()[0]
+
+    @property
+    def edge_array(self) -> EdgeArray:
+        """
+        'EdgeArray' of the edges of this polygon, created when it is needed the first time.
+        """
+        return self._get_edge_index()[1]
+
+    def _get_edge_index(self):
+        if self._edge_index is None or self._edge_index[0] is not self.edges:
+            # the edges are replaced when the polygon is expanded in the constructor
+            self._edge_index = (self.edges, EdgeGrid(self.edges), EdgeArray(self.edges))
+        return self._edge_index[1:]
+
+    def point_in_polygon(self, point: Point, indices=None) -> bool:
         """
-        Determines if 'point' lies in this polygon.
+        Determines if 'point' lies in this polygon. Points on the border lie in the polygon.
         :param point: a 'Point'
+        :param indices: Optional. If given, only the edges with these indices in 'Polygon.edges' are tested. They must
+        contain all edges which can intersect the line from 'point' to the y-axis (e.g. from 'EdgeGrid.query_indices').
         :return: True if the point lies in this polygon otherwise False
         """
-        # count the intersections to the y-axis
-        line = LineSegment(point, Point(0, point.y))
-        count = 0
-        count_under = 0
-        count_over = 0
-        for edge in self.edges:
-            intersection = get_intersection(line, edge)
-            if intersection is None:
-                continue
-            if intersection.has_same_point(point):
+        return self._contains(point.x, point.y, 1, indices)
+
+    def midpoint_in_polygon(self, point1: Point, point2: Point) -> bool:
+        """
+        Determines if the midpoint between 'point1' and 'point2' lies in this polygon (like 'Polygon.point_in_polygon').
+        For integer coordinates, the doubled midpoint is tested exactly.
+        """
+        if is_exact(point1) and is_exact(point2):
+            return self._contains(point1.x + point2.x, point1.y + point2.y, 2)
+        return self._contains((point1.x + point2.x) / 2, (point1.y + point2.y) / 2, 1)
+
+    def _contains(self, x, y, scale: int, indices=None) -> bool:
+        """
+        Crossing number test: the edges are counted which cross the line from the point to the y-axis. An edge is only
+        counted if exactly one end point lies above the line (half-open rule), so that lines through vertices are
+        counted correctly. If the point and all vertices have integer coordinates, no division is used, otherwise
+        points on the border are found with a small tolerance.
+        :param x: x-coordinate of the point multiplied by 'scale'
+        :param y: y-coordinate of the point multiplied by 'scale'
+        :param scale: factor of the coordinates (2 for midpoints)
+        :param indices: Optional. See 'Polygon.point_in_polygon'
+        """
+        min_x, min_y, max_x, max_y = self.bounding_box
+        if not (min_x * scale <= x <= max_x * scale and min_y * scale <= y <= max_y * scale):
+            return False
+        if indices is None and len(self.edges) >= self.EDGE_GRID_MIN_EDGES:
+            # only the part of the line to the y-axis inside the bounding box can cross edges
+            indices = self.edge_grid.query_coordinates(max(min_x, 0), y / scale, x / scale, y / scale)
+        edge_array = self.edge_array
+        x1, y1, x2, y2 = edge_array.x1, edge_array.y1, edge_array.x2, edge_array.y2
+        inside = False
+        if edge_array.exact and type(x) is int and type(y) is int:
+            for i in (range(len(x1)) if indices is None else indices):
+                ex1, ey1, ex2, ey2 = x1[i] * scale, y1[i] * scale, x2[i] * scale, y2[i] * scale
+                if (ex2 - ex1) * (y - ey1) == (ey2 - ey1) * (x - ex1) and \
+                        min(ex1, ex2) <= x <= max(ex1, ex2) and min(ey1, ey2) <= y <= max(ey1, ey2):
+                    return True  # the point lies on this edge
+                if (ey1 > y) != (ey2 > y):
+                    # the x-coordinate of the crossing is ex1 + numerator/denominator, it must be between 0 and x
+                    numerator = (y - ey1) * (ex2 - ex1)
+                    denominator = ey2 - ey1
+                    if denominator < 0:
+                        numerator, denominator = -numerator, -denominator
+                    crossing = ex1 * denominator + numerator
+                    if 0 <= crossing < x * denominator:
+                        inside = not inside
+            return inside
+        x, y = x / scale, y / scale
+        tolerance = 1e-9 * max(abs(x), abs(y), 1)  # like math.isclose
+        for i in (range(len(x1)) if indices is None else indices):
+            ex1, ey1, ex2, ey2 = x1[i], y1[i], x2[i], y2[i]
+            if (ey1 > y) != (ey2 > y):
+                crossing = ex1 + (y - ey1) * (ex2 - ex1) / (ey2 - ey1)
+                if abs(crossing - x) <= tolerance:
+                    return True  # the point lies on this edge
+                if 0 <= crossing < x:
+                    inside = not inside
+            if abs(ey1 - y) <= tolerance and (abs(ex1 - x) <= tolerance or (
+                    abs(ey2 - y) <= tolerance and min(ex1, ex2) <= x <= max(ex1, ex2))):
+                return True  # the point lies on a vertex or on a horizontal edge
+        return inside
+
+
+def points_in_other_polygons(points: List[Node], polygons: List[Polygon], stats=None) -> List[bool]:
+    """
+    Classifies all points against all polygons at once: the points are sorted by their x-coordinate, so that every
+    polygon only tests the points inside its bounding box.
+    :param points: Nodes (or Points); a Node is not tested against its own polygon ('Node.polygon')
+    :param polygons: all polygons
+    :param stats: Optional. 'instrumentation.Instrumentation' which counts the calls of 'Polygon.point_in_polygon'
+    :return: for every point True if it lies in at least one polygon which is not its own one
+    """
+    order = sorted(range(len(points)), key=lambda i: points[i].x)
+    xs = [points[i].x for i in order]
+    result = [False] * len(points)
+    for polygon in polygons:
+        min_x, min_y, max_x, max_y = polygon.bounding_box
+        for k in range(bisect.bisect_left(xs, min_x), bisect.bisect_right(xs, max_x)):
+            i = order[k]
+            point = points[i]
+            if not result[i] and min_y <= point.y <= max_y and getattr(point, "polygon", None) is not polygon:
+                if stats is not None:
+                    stats.count("point_in_polygon")
+                if polygon.point_in_polygon(point):
+                    result[i] = True
+    return result
+
+
+def merge_overlapping_polygons(polygons: List[Polygon]) -> List[Polygon]:
+    """
+    Replaces every group of overlapping or touching polygons by one polygon with the boundary of their union
+    ('minkowski.polygon_union'). Edges and vertices inside the union are removed, so that the rotational plane sweeps
+    test fewer edges. A group whose union has holes is not merged, because Lisa's house could lie in a hole.
+    A merged polygon gets the id of the first polygon of its group, the polygons it was created from are stored in
+    'Polygon.merged_polygons'. The edges of the polygons of an unmerged group can still cross each other (see
+    'edges_cross').
+    :param polygons: all polygons
+    :return: list of polygons (polygons without overlaps are returned unchanged)
+    """
+    coordinates = [[(_to_exact(point.x), _to_exact(point.y)) for point in polygon.points] for polygon in polygons]
+    # union-find over all pairs of polygons whose bounding boxes overlap (sweep along the x-axis)
+    parents = list(range(len(polygons)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    order = sorted(range(len(polygons)), key=lambda i: polygons[i].bounding_box[0])
+    active = []
+    for i in order:
+        min_x, min_y, max_x, max_y = polygons[i].bounding_box
+        active = [j for j in active if polygons[j].bounding_box[2] >= min_x]
+        for j in active:
+            other_box = polygons[j].bounding_box
+            if other_box[1] <= max_y and min_y <= other_box[3] and find(i) != find(j) and \
+                    polygons_overlap(coordinates[i], coordinates[j]):
+                parents[find(i)] = find(j)
+        active.append(i)
+    groups = {}
+    for i in range(len(polygons)):
+        groups.setdefault(find(i), []).append(i)
+    merged = []
+    for group in sorted(groups.values()):
+        boundaries = polygon_union([coordinates[i] for i in group], holes=True) if len(group) > 1 else []
+        if len(group) == 1 or any(signed_area(boundary) < 0 for boundary in boundaries):
+            merged.extend(polygons[i] for i in group)
+            continue
+        # the union of a connected group has exactly one outer boundary
+        boundary = max(boundaries, key=signed_area)
+        polygon = Polygon([Node(to_number(x), to_number(y)) for x, y in boundary], polygons[group[0]].polygon_id)
+        polygon.merged_polygons = [polygons[i] for i in group]
+        merged.append(polygon)
+    return merged
+
+
+def edges_cross(edges: List[LineSegment]) -> bool:
+    """
+    Determines if any two of the given edges cross each other, i.e. they intersect in a point which lies inside both
+    edges. Edges which only touch each other or lie on the same line do not cross. The edges are swept along the
+    x-axis, so only pairs of edges whose bounding boxes overlap are tested. The result is exact for integer
+    coordinates.
+    """
+    boxes = sorted(((min(edge.p1.x, edge.p2.x), max(edge.p1.x, edge.p2.x),
+                     min(edge.p1.y, edge.p2.y), max(edge.p1.y, edge.p2.y), edge) for edge in edges),
+                   key=lambda box: box[0])
+    active = []
+    for min_x, max_x, min_y, max_y, edge in boxes:
+        active = [box for box in active if box[1] >= min_x]
+        for other in active:
+            if other[2] <= max_y and min_y <= other[3] and _cross_properly(edge, other[4]):
                 return True
-            cond1 = intersection.has_same_point(edge.p1)  # intersection is on point edge.p1
-            cond2 = intersection.has_same_point(edge.p2)  # intersection is on point edge.p2
-            if (not cond1 and not cond2):
-                count += 1
-            elif (cond1 and edge.p2.y < line.p2.y) or (cond2 and edge.p1.y < line.p2.y):
-                count_under += 1
-            elif (cond1 and edge.p2.y > line.p2.y) or (cond2 and edge.p1.y > line.p2.y):
-                count_over += 1
-        if count_under%2 != count_over%2:
-            return True
-        return (count+count_under) % 2 == 1  # if number is odd, point lies in this polygon
+        active.append((min_x, max_x, min_y, max_y, edge))
+    return False
+
+
+def _cross_properly(line1: LineSegment, line2: LineSegment) -> bool:
+    o1 = orientation(line1.p1, line1.p2, line2.p1)
+    o2 = orientation(line1.p1, line1.p2, line2.p2)
+    if not ((o1 > 0 and o2 < 0) or (o1 < 0 and o2 > 0)):
+        return False
+    o3 = orientation(line2.p1, line2.p2, line1.p1)
+    o4 = orientation(line2.p1, line2.p2, line1.p2)
+    return (o3 > 0 and o4 < 0) or (o3 < 0 and o4 > 0)
+
+
+def segment_intersects_box(point1: Point, point2: Point, box) -> bool:
+    """
+    Determines if the segment from 'point1' to 'point2' touches the axis-aligned box (Liang-Barsky clipping).
+    :param point1: one end of the segment
+    :param point2: the other end of the segment
+    :param box: tuple (min_x, min_y, max_x, max_y), e.g. from 'Polygon.get_bounding_box'
+    :return: True if at least one point of the segment lies in the box (including its border)
+    """
+    min_x, min_y, max_x, max_y = box
+    dx = point2.x - point1.x
+    dy = point2.y - point1.y
+    t_min, t_max = 0, 1
+    for direction, distance_min, distance_max in ((dx, point1.x - min_x, max_x - point1.x),
+                                                  (dy, point1.y - min_y, max_y - point1.y)):
+        if direction == 0:
+            if distance_min < 0 or distance_max < 0:
+                return False  # parallel and outside
+            continue
+        t1 = -distance_min / direction
+        t2 = distance_max / direction
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_min = max(t_min, t1)
+        t_max = min(t_max, t2)
+        if t_min > t_max:
+            return False
+    return True
+
+
+def is_exact(point: Point) -> bool:
+    """
+    Returns True if both coordinates of 'point' are integers, so that exact predicates can be used.
+    """
+    return type(point.x) is int and type(point.y) is int
+
+
+def orientation(point1: Point, point2: Point, point3: Point):
+    """
+    Calculates on which side of the line from 'point1' to 'point2' the point 'point3' lies. The result is exact for
+    integer coordinates.
+    :return: > 0: left (counter-clockwise), < 0: right (clockwise), 0: on the line
+    """
+    return (point2.x - point1.x) * (point3.y - point1.y) - (point2.y - point1.y) * (point3.x - point1.x)
+
+
+def segments_cross(line1: LineSegment, line2: LineSegment) -> bool:
+    """
+    Returns True if the two segments intersect, exactly like 'get_intersection(line1, line2) is not None'. For
+    integer coordinates, the intersection point is not calculated, only the orientations of the end points are tested.
+    """
+    return segment_crosses(line1, line2.p1, line2.p2, line2.exact)
+
+
+def segment_crosses(line: LineSegment, point1: Point, point2: Point, exact: bool = None) -> bool:
+    """
+    Like 'segments_cross(line, LineSegment(point1, point2))', but without creating the second 'LineSegment'.
+    :param exact: Optional. Must be True if both points have integer coordinates (calculated if not given)
+    """
+    if exact is None:
+        exact = is_exact(point1) and is_exact(point2)
+    if not (exact and line.exact):
+        return get_intersection(line, LineSegment(point1, point2)) is not None
+    p1, p2 = line.p1, line.p2
+    if p1 is point1 or p1 is point2 or p2 is point1 or p2 is point2:
+        return False
+    ax, ay, bx, by = p1.x, p1.y, p2.x, p2.y
+    cx, cy, dx, dy = point1.x, point1.y, point2.x, point2.y
+    rx, ry, sx, sy = bx - ax, by - ay, dx - cx, dy - cy
+    if rx * sy == ry * sx:
+        return False  # parallel
+    o1 = rx * (cy - ay) - ry * (cx - ax)
+    o2 = rx * (dy - ay) - ry * (dx - ax)
+    if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+        return False
+    o3 = sx * (ay - cy) - sy * (ax - cx)
+    o4 = sx * (by - cy) - sy * (bx - cx)
+    return not ((o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0))
+
+
+def _to_exact(value):
+    """
+    Converts a coordinate to an int or an exact 'Fraction' (floats are converted without rounding).
+    """
+    return value if type(value) is int else Fraction(value)
+
+
+def to_number(value):
+    """
+    Converts a coordinate (e.g. an exact 'Fraction' of 'minkowski.minkowski_sum' or a float of a request) to an int if
+    it is integral, otherwise to a float. Integral coordinates stay ints, so that the exact predicates can be used.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, Fraction):
+        return int(value) if value.denominator == 1 else float(value)
+    value = float(value)
+    return int(value) if value.is_integer() else value
 
 
 def get_intersection(line1: LineSegment, line2: LineSegment):
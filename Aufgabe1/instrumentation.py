@@ -0,0 +1,166 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul stellt die Klasse 'Instrumentation' bereit, die für jede Phase eines 'WaySearcher's (Sichtbarkeitsgraph,
+Suche) Laufzeiten, Zähler (z.B. Aufrufe von 'get_intersection' und 'point_in_polygon') und Histogramme (Anzahl der
+aktiven Kanten je Ursprung des Rotational Plane Sweeps) sammelt. Gezählt wird nur an den Aufrufstellen eines
+'WaySearcher's, dessen Instrumentation aktiviert ist, sodass sich mehrere 'WaySearcher' (auch in verschiedenen
+Threads) nicht gegenseitig beeinflussen. Ohne Instrumentation kostet das Zählen also nichts.
+"""
+import collections
+import contextlib
+import functools
+import json
+import time
+
+from active_edges import ActiveEdges
+from geometry import is_exact, segment_crosses
+
+
+class Instrumentation:
+    """
+    Collects counters, timings and histograms for every phase of one 'WaySearcher' (see 'instrumented_phase').
+    """
+
+    def __init__(self):
+        self.phases = collections.OrderedDict()  # phase name -> {"calls", "seconds", "counters", "histograms"}
+        self._current = None  # name of the running phase
+
+    def _get_phase(self, name: str) -> dict:
+        if name not in self.phases:
+            self.phases[name] = {"calls": 0, "seconds": 0.0, "counters": collections.Counter(),
+                                 "histograms": collections.defaultdict(collections.Counter)}
+        return self.phases[name]
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Context manager for one phase. Phases may be nested, the counters are added to the innermost phase.
+        """
+        previous = self._current
+        self._current = name
+        t1 = time.perf_counter()
+        try:
+            yield self
+        finally:
+            t2 = time.perf_counter()
+            data = self._get_phase(name)
+            data["calls"] += 1
+            data["seconds"] += t2 - t1
+            self._current = previous
+
+    def count(self, name: str, n: int = 1):
+        if self._current is not None:
+            self._get_phase(self._current)["counters"][name] += n
+
+    def histogram(self, name: str, value: int):
+        """
+        Adds 'value' to the histogram 'name' of the running phase. The buckets are powers of two: 0, 1, 2-3, 4-7, ...
+        """
+        if self._current is not None:
+            bucket = 0 if value <= 0 else 1 << (value.bit_length() - 1)
+            self._get_phase(self._current)["histograms"][name][bucket] += 1
+
+    def record_sweep(self, nodes: int, max_active_edges: int, visible_lines: int):
+        """
+        Called by 'WaySearcher._rotational_plane_sweep' once for every origin.
+        """
+        self.count("sweeps")
+        self.count("sweep_nodes", nodes)
+        self.count("visible_lines", visible_lines)
+        self.histogram("active_edges_per_origin", max_active_edges)
+
+    def counted(self, function, counter: str, count_items: bool = False):
+        """
+        :return: wrapper of 'function' which counts its calls as 'counter' (and the number of returned items as
+        'counter' + "_items" if 'count_items' is True)
+        """
+        @functools.wraps(function)
+        def counted(*args, **kwargs):
+            result = function(*args, **kwargs)
+            self.count(counter)
+            if count_items:
+                self.count(counter + "_items", len(result))
+            return result
+        return counted
+
+    def segment_crosses(self, line, point1, point2, exact: bool = None) -> bool:
+        """
+        'geometry.segment_crosses' which counts the test as "segment_tests" and, if the intersection point has to be
+        calculated, as "get_intersection".
+        """
+        self.count("segment_tests")
+        if exact is None:
+            exact = is_exact(point1) and is_exact(point2)
+        if not (exact and line.exact):
+            self.count("get_intersection")
+        return segment_crosses(line, point1, point2, exact)
+
+    def to_dict(self) -> dict:
+        """
+        :return: all phases with sorted counters and histograms (the histogram buckets are strings)
+        """
+        return {name: {"calls": data["calls"],
+                       "seconds": data["seconds"],
+                       "counters": dict(sorted(data["counters"].items())),
+                       "histograms": {histogram: {str(bucket): count for bucket, count in sorted(buckets.items())}
+                                      for histogram, buckets in sorted(data["histograms"].items())}}
+                for name, data in self.phases.items()}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def instrumented_phase(name: str):
+    """
+    Decorator for methods of 'WaySearcher': if 'WaySearcher.instrumentation' is not None, the method runs as the phase
+    'name', otherwise it is called directly.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return method(self, *args, **kwargs)
+            with self.instrumentation.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TrackedSet(set):
+    """
+    Set of active edges which remembers its greatest size (used instead of 'set' by an instrumented sweep).
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.max_size = len(self)
+
+    def add(self, edge):
+        super().add(edge)
+        self.max_size = max(self.max_size, len(self))
+
+    def __ixor__(self, other):
+        super().__ixor__(other)
+        self.max_size = max(self.max_size, len(self))
+        return self
+
+
+class TrackedActiveEdges(ActiveEdges):
+    """
+    'ActiveEdges' which remembers its greatest size (used by an instrumented sweep).
+    """
+
+    def __init__(self, origin):
+        super().__init__(origin)
+        self.max_size = 0
+
+    def add(self, edge):
+        super().add(edge)
+        self.max_size = max(self.max_size, len(self))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul erzeugt zufällige Karten im Format der BwInf-Website. Die Hindernisse liegen in den Zellen eines
+Gitters, sodass sie sich nicht überschneiden. Anzahl und Eckenzahl der Polygone, der Anteil nicht-konvexer Polygone
+und die Dichte (Anteil der Zellen mit Hindernis) sind einstellbar, optional bekommt Lisa ein Polygon.
+
+Aufruf: map_generator.py POLYGONE [--vertices MIN MAX] [--concave ANTEIL] [--density DICHTE] [--lisa-polygon ECKEN]
+                         [--seed SEED] [-o DATEI]
+"""
+import argparse
+import math
+import random
+import sys
+from typing import List, Tuple
+
+
+def random_polygon(rng: random.Random, center: Tuple[float, float], radius: float, vertex_count: int,
+                   concave: bool) -> List[Tuple[int, int]]:
+    """
+    Creates a simple polygon around 'center' whose vertices lie at most 'radius' away from it. The vertices are sorted
+    by their angle and two neighbors are less than 180° apart, so the polygon is star-shaped and never intersects
+    itself.
+    :param concave: if True, every second vertex is moved towards the center, otherwise all vertices lie on a circle
+    (so the polygon is convex)
+    :return: list of integer vertices, counter-clockwise
+    """
+    step = 2 * math.pi / vertex_count
+    angles = [i * step + rng.uniform(-0.3, 0.3) * step for i in range(vertex_count)]
+    vertices = []
+    for i, angle in enumerate(angles):
+        r = radius * (rng.uniform(0.3, 0.6) if concave and i % 2 else 1)
+        vertex = (int(round(center[0] + r * math.cos(angle))), int(round(center[1] + r * math.sin(angle))))
+        if not vertices or vertex != vertices[-1]:
+            vertices.append(vertex)
+    if len(vertices) > 1 and vertices[0] == vertices[-1]:
+        vertices.pop()
+    return vertices
+
+
+def generate_map(polygon_count: int, vertices: Tuple[int, int] = (3, 8), concave: float = 0.3, density: float = 0.6,
+                 lisa_polygon: int = 0, cell_size: int = 100, seed=None) -> str:
+    """
+    Generates a random map in the format described on the BwInf-Website.
+    :param polygon_count: number of obstacles
+    :param vertices: minimum and maximum number of vertices of an obstacle
+    :param concave: share of obstacles which are not convex (0 to 1)
+    :param density: share of the grid cells which contain an obstacle (0 to 1), smaller values create wider gaps
+    :param lisa_polygon: number of vertices of Lisa's polygon, 0 for no polygon
+    :param cell_size: size of a grid cell, every obstacle fits into its cell
+    :param seed: seed of the random number generator, the same seed always creates the same map
+    :return: contents of the file
+    """
+    if not 0 < density <= 1:
+        raise ValueError("density must be greater than 0 and at most 1")
+    rng = random.Random(seed)
+    cell_count = max(polygon_count + 1, int(math.ceil((polygon_count + 1) / density)))
+    columns = max(1, int(math.ceil(math.sqrt(cell_count))))
+    rows = int(math.ceil(cell_count / columns))
+    # Lisa's house lies in the middle of the right column, this cell stays empty
+    lisa_cell = (rows // 2) * columns + columns - 1
+    cells = rng.sample([i for i in range(rows * columns) if i != lisa_cell], polygon_count)
+    lines = [str(polygon_count)]
+    for cell in cells:
+        row, column = divmod(cell, columns)
+        radius = cell_size * rng.uniform(0.25, 0.45)
+        center = ((column + 0.5) * cell_size + rng.uniform(-1, 1) * (cell_size / 2 - radius),
+                  (row + 0.5) * cell_size + rng.uniform(-1, 1) * (cell_size / 2 - radius))
+        polygon = []
+        while len(polygon) < 3:  # rounding can merge vertices of small polygons
+            polygon = random_polygon(rng, center, radius, rng.randint(*vertices), rng.random() < concave)
+        lines.append("{} {}".format(len(polygon), " ".join("{} {}".format(x, y) for x, y in polygon)))
+    lisa_row, lisa_column = divmod(lisa_cell, columns)
+    lisa = (int((lisa_column + 0.5) * cell_size), int((lisa_row + 0.5) * cell_size))
+    lisa_line = "{} {}".format(*lisa)
+    if lisa_polygon:
+        polygon = random_polygon(rng, lisa, cell_size * 0.05, lisa_polygon, False)
+        lisa_line += " {} {}".format(len(polygon), " ".join("{} {}".format(x, y) for x, y in polygon))
+    lines.append(lisa_line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates a random map with non-overlapping obstacles.")
+    parser.add_argument("polygons", type=int, help="number of obstacles")
+    parser.add_argument("--vertices", type=int, nargs=2, default=(3, 8), metavar=("MIN", "MAX"))
+    parser.add_argument("--concave", type=float, default=0.3, help="share of non-convex obstacles")
+    parser.add_argument("--density", type=float, default=0.6, help="share of grid cells with an obstacle")
+    parser.add_argument("--lisa-polygon", type=int, default=0, help="number of vertices of Lisa's polygon")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' (standard) for stdout")
+    args = parser.parse_args()
+    text = generate_map(args.polygons, tuple(args.vertices), args.concave, args.density, args.lisa_polygon,
+                        seed=args.seed)
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
@@ -0,0 +1,501 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul berechnet die Minkowski-Summe zweier Polygone. Konvexe Polygone werden in linearer Zeit zusammengeführt,
+bei nicht-konvexen Polygonen wird der Rand in konvexe Ketten zerlegt, jede Kette zu den konvexen Teilen des anderen
+Polygons addiert und die Summen der Teile danach vereinigt ('polygon_union').
+Alle Berechnungen sind exakt (ganze Zahlen bzw. 'fractions.Fraction'), Punkte werden als Tupel (x, y) dargestellt.
+"""
+import math
+from fractions import Fraction
+from typing import List, Tuple
+
+Coordinates = Tuple  # (x, y) with int or Fraction values
+
+
+def _cross(o: Coordinates, a: Coordinates, b: Coordinates):
+    """
+    Cross product of the vectors o->a and o->b (> 0: counter-clockwise turn, < 0: clockwise turn, 0: collinear).
+    """
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def signed_area(points: List[Coordinates]):
+    """
+    Calculates twice the signed area of a polygon (positive if the vertices are ordered counter-clockwise).
+    """
+    return sum(points[i-1][0] * points[i][1] - points[i][0] * points[i-1][1] for i in range(len(points)))
+
+
+def remove_collinear(points: List[Coordinates]) -> List[Coordinates]:
+    """
+    Removes duplicate vertices and vertices which lie on the straight line between their neighbors (in one pass with a
+    stack, at least three vertices are kept).
+    """
+    points = [p for i, p in enumerate(points) if p != points[i-1]]
+    result = []
+    for i, point in enumerate(points):
+        # len(result) + len(points) - i is the number of vertices which are left if result[-1] is kept
+        while len(result) >= 2 and len(result) + len(points) - i > 3 and _cross(result[-2], result[-1], point) == 0:
+            result.pop()
+        result.append(point)
+    # the vertices at the end of 'result' are neighbors of those at its beginning
+    first = 0
+    while len(result) - first > 3:
+        if _cross(result[-2], result[-1], result[first]) == 0:
+            result.pop()
+        elif _cross(result[-1], result[first], result[first + 1]) == 0:
+            first += 1
+        else:
+            break
+    return result[first:]
+
+
+def counter_clockwise(points: List[Coordinates]) -> List[Coordinates]:
+    """
+    Returns the vertices in counter-clockwise order.
+    """
+    return list(points) if signed_area(points) >= 0 else list(reversed(points))
+
+
+def is_convex(points: List[Coordinates]) -> bool:
+    """
+    Determines if the counter-clockwise polygon 'points' is convex.
+    """
+    return all(_cross(points[i-2], points[i-1], points[i]) >= 0 for i in range(len(points)))
+
+
+def triangulate(points: List[Coordinates]) -> List[List[Coordinates]]:
+    """
+    Splits a simple, counter-clockwise polygon into triangles (ear clipping).
+    """
+    remaining = remove_collinear(points)
+    triangles = []
+    while len(remaining) > 3:
+        for i in range(len(remaining)):
+            previous, vertex, following = remaining[i-1], remaining[i], remaining[(i+1) % len(remaining)]
+            if _cross(previous, vertex, following) <= 0:
+                continue  # reflex vertex
+            triangle = (previous, vertex, following)
+            if any(point not in triangle and _cross(previous, vertex, point) >= 0 and
+                   _cross(vertex, following, point) >= 0 and _cross(following, previous, point) >= 0
+                   for point in remaining):
+                continue  # another vertex lies in this triangle
+            triangles.append([previous, vertex, following])
+            del remaining[i]
+            break
+        else:
+            break  # no ear found, the polygon is not simple
+        remaining = remove_collinear(remaining)
+    if len(remaining) == 3 and _cross(*remaining) > 0:
+        triangles.append(remaining)
+    return triangles
+
+
+def convex_parts(points: List[Coordinates]) -> List[List[Coordinates]]:
+    """
+    Splits a simple polygon into convex, counter-clockwise parts. A convex polygon is returned unchanged.
+    """
+    points = remove_collinear(counter_clockwise(points))
+    if len(points) < 3 or is_convex(points):
+        return [points]
+    return triangulate(points)
+
+
+def convex_minkowski_sum(polygon1: List[Coordinates], polygon2: List[Coordinates]) -> List[Coordinates]:
+    """
+    Calculates the Minkowski sum of two convex, counter-clockwise polygons by merging their edges sorted by angle
+    (O(n + m)).
+    """
+    def rotated(points):
+        # start with the lowest vertex (the leftmost one if there are more than one)
+        start = min(range(len(points)), key=lambda i: (points[i][1], points[i][0]))
+        return points[start:] + points[:start]
+
+    p = rotated(polygon1)
+    q = rotated(polygon2)
+    p += p[:2]
+    q += q[:2]
+    result = []
+    i = j = 0
+    while i < len(p) - 2 or j < len(q) - 2:
+        result.append((p[i][0] + q[j][0], p[i][1] + q[j][1]))
+        cross = (p[i+1][0] - p[i][0]) * (q[j+1][1] - q[j][1]) - (p[i+1][1] - p[i][1]) * (q[j+1][0] - q[j][0])
+        if cross >= 0 and i < len(p) - 2:
+            i += 1
+        if cross <= 0 and j < len(q) - 2:
+            j += 1
+    return remove_collinear(result)
+
+
+def convex_hull(points: List[Coordinates]) -> List[Coordinates]:
+    """
+    Calculates the convex hull of points (monotone chain, O(n log n)).
+    :return: counter-clockwise vertices of the hull without collinear vertices
+    """
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(points):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
+
+
+def _crosses_properly(a: Coordinates, b: Coordinates, c: Coordinates, d: Coordinates) -> bool:
+    """
+    Determines if the segments a-b and c-d cross in a single point which is no end point of them.
+    """
+    side1, side2 = _cross(a, b, c), _cross(a, b, d)
+    side3, side4 = _cross(c, d, a), _cross(c, d, b)
+    return ((side1 > 0 > side2) or (side1 < 0 < side2)) and ((side3 > 0 > side4) or (side3 < 0 < side4))
+
+
+class _Grid:
+    """
+    Uniform grid of the vertices and edges of a polygon (about one vertex per cell), so that only the vertices and edges
+    near a region have to be tested.
+    """
+
+    def __init__(self, points: List[Coordinates]):
+        self.n = len(points)
+        xs, ys = [float(p[0]) for p in points], [float(p[1]) for p in points]
+        self.min_x, self.min_y = min(xs), min(ys)
+        self.size = max(max(xs) - self.min_x, max(ys) - self.min_y) / max(1.0, math.sqrt(self.n)) or 1.0
+        self.vertices = {}  # cell -> indices of the vertices in this cell
+        self.edges = {}  # cell -> indices i of the edges points[i-1]-points[i] whose bounding boxes overlap this cell
+        for i in range(self.n):
+            self.vertices.setdefault(self._cell(xs[i], ys[i]), []).append(i)
+            for cell in self._cells(min(xs[i-1], xs[i]), min(ys[i-1], ys[i]), max(xs[i-1], xs[i]), max(ys[i-1], ys[i])):
+                self.edges.setdefault(cell, []).append(i)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int((x - self.min_x) // self.size), int((y - self.min_y) // self.size)
+
+    def _cells(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        x1, y1 = self._cell(min_x, min_y)
+        x2, y2 = self._cell(max_x, max_y)
+        return ((x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1))
+
+    def query(self, table: dict, points: List[Coordinates]):
+        """
+        :param table: 'self.vertices' or 'self.edges'
+        :return: indices of all items of 'table' in the cells which overlap the bounding box of 'points' (all indices
+        if the bounding box covers more cells than there are items)
+        """
+        xs, ys = [float(p[0]) for p in points], [float(p[1]) for p in points]
+        x1, y1 = self._cell(min(xs), min(ys))
+        x2, y2 = self._cell(max(xs), max(ys))
+        if (x2 - x1 + 1) * (y2 - y1 + 1) > self.n:
+            return range(self.n)
+        return {i for cell in self._cells(min(xs), min(ys), max(xs), max(ys)) for i in table.get(cell, ())}
+
+
+def _can_extend(points: List[Coordinates], grid: _Grid, in_chain: set, chain: List[Coordinates], index: int) -> bool:
+    """
+    Determines if the polygon formed by 'chain' + [points[index]] (consecutive vertices of a simple, counter-clockwise
+    polygon, closed by the line from the last to the first vertex) is convex and lies inside the polygon 'points'. The
+    polygon of 'chain' must fulfil this already, so only the triangle which is added to it is tested: the angles at its
+    corners must stay convex, no other vertex may lie in or on the triangle and no edge may cross the new closing line
+    (an edge could only enter the chain polygon through this line).
+    :param in_chain: indices of the vertices of 'chain'
+    """
+    first, last, candidate = chain[0], chain[-1], points[index]
+    if _cross(chain[-2], last, candidate) <= 0 or _cross(last, candidate, first) <= 0 or \
+            _cross(candidate, first, chain[1]) <= 0:
+        return False
+    triangle = (first, last, candidate)
+    for i in grid.query(grid.vertices, triangle):
+        point = points[i]
+        if i not in in_chain and i != index and _cross(first, last, point) >= 0 and _cross(last, candidate, point) >= 0 and \
+                _cross(candidate, first, point) >= 0:
+            return False
+    for i in grid.query(grid.edges, (candidate, first)):
+        if _crosses_properly(candidate, first, points[i-1], points[i]):
+            return False
+    return True
+
+
+def convex_chains(points: List[Coordinates]) -> List[List[Coordinates]]:
+    """
+    Splits the boundary of a simple, counter-clockwise polygon into chains of consecutive vertices. Every chain is as
+    long as possible while its polygon (closed by the line from the last to the first vertex) is convex and lies inside
+    the polygon, so chains start and end at reflex vertices if possible. Every edge belongs to exactly one chain.
+    """
+    n = len(points)
+    grid = _Grid(points)
+    start = next((i for i in range(n) if _cross(points[i-1], points[i], points[(i+1) % n]) < 0), 0)
+    chains = []
+    covered = 0  # number of edges in 'chains'
+    while covered < n:
+        first = start + covered
+        chain = [points[first % n], points[(first + 1) % n]]
+        in_chain = {first % n, (first + 1) % n}
+        covered += 1
+        while covered < n:
+            index = (start + covered + 1) % n
+            if not _can_extend(points, grid, in_chain, chain, index):
+                break
+            chain.append(points[index])
+            in_chain.add(index)
+            covered += 1
+        chains.append(chain)
+    return chains
+
+
+def minkowski_sum(polygon1: List[Coordinates], polygon2: List[Coordinates]) -> List[List[Coordinates]]:
+    """
+    Calculates the Minkowski sum of two simple polygons. If both are convex, 'convex_minkowski_sum' is used.
+    Otherwise, the boundary of the non-convex polygon is split into convex chains ('convex_chains'), every chain is
+    added to every convex part of the other polygon and these pieces are united with 'polygon_union'. Every point of
+    the sum lies in one of the pieces or in the non-convex polygon shifted by a vertex of the other one, and the
+    boundary of the shifted polygon lies in the pieces, so the pieces have the same outer boundary as the sum. Unlike
+    the parts of a triangulation, the pieces only overlap their neighbors, which keeps the union fast.
+    :return: list of counter-clockwise polygons (the outer boundary of the sum and possibly smaller polygons in its
+    holes)
+    """
+    polygon1 = remove_collinear(counter_clockwise(polygon1))
+    polygon2 = remove_collinear(counter_clockwise(polygon2))
+    convex1 = len(polygon1) >= 3 and is_convex(polygon1)
+    convex2 = len(polygon2) >= 3 and is_convex(polygon2)
+    if convex1 and convex2:
+        return [convex_minkowski_sum(polygon1, polygon2)]
+    if convex1:
+        # the boundary of the non-convex polygon is used, only the other one is split into convex parts
+        polygon1, polygon2 = polygon2, polygon1
+    parts2 = [part for part in convex_parts(polygon2) if len(part) >= 3]
+    pieces = [convex_hull([(a[0] + x, a[1] + y) for a in chain for x, y in part])
+              for chain in convex_chains(polygon1)
+              for part in parts2]
+    return polygon_union(pieces)
+
+
+def _segment_intersections(a: Coordinates, b: Coordinates, c: Coordinates, d: Coordinates) -> List[Coordinates]:
+    """
+    Calculates all points which both segments a-b and c-d have in common (the end points of the common part if the
+    segments are collinear).
+    """
+    r = (b[0] - a[0], b[1] - a[1])
+    s = (d[0] - c[0], d[1] - c[1])
+    ca = (c[0] - a[0], c[1] - a[1])
+    denominator = r[0] * s[1] - r[1] * s[0]
+    if denominator != 0:
+        t = ca[0] * s[1] - ca[1] * s[0]
+        u = ca[0] * r[1] - ca[1] * r[0]
+        if denominator < 0:
+            t, u, denominator = -t, -u, -denominator
+        if 0 <= t <= denominator and 0 <= u <= denominator:
+            # most intersections are common end points, they are returned without any division
+            if t == 0:
+                return [a]
+            if t == denominator:
+                return [b]
+            if u == 0:
+                return [c]
+            if u == denominator:
+                return [d]
+            return [(_divide(a[0] * denominator + t * r[0], denominator),
+                     _divide(a[1] * denominator + t * r[1], denominator))]
+        return []
+    if ca[0] * r[1] - ca[1] * r[0] != 0:
+        return []  # parallel
+    # collinear: the common part is limited by end points of both segments
+    length = r[0] * r[0] + r[1] * r[1]
+    if length == 0:
+        return []
+
+    def parameter(point):
+        return Fraction((point[0] - a[0]) * r[0] + (point[1] - a[1]) * r[1], length)
+
+    t_c, t_d = parameter(c), parameter(d)
+    low, high = max(0, min(t_c, t_d)), min(1, max(t_c, t_d))
+    if low > high:
+        return []
+    return [_point_at(a, r, t) for t in {low, high}]
+
+
+def _divide(numerator, denominator: int):
+    """
+    Divides exactly. The result is an int if possible, because Fractions are much slower.
+    """
+    if type(numerator) is int and numerator % denominator == 0:
+        return numerator // denominator
+    quotient = Fraction(numerator, denominator)
+    return quotient.numerator if quotient.denominator == 1 else quotient
+
+
+def _point_at(a: Coordinates, r: Coordinates, t: Fraction) -> Coordinates:
+    """
+    Returns the point a + t*r. Integer coordinates are stored as int, because Fractions are much slower.
+    """
+    x, y = a[0] + t * r[0], a[1] + t * r[1]
+    return (x.numerator if x.denominator == 1 else x), (y.numerator if y.denominator == 1 else y)
+
+
+def _angle(start: Coordinates, end: Coordinates) -> float:
+    """
+    Returns the angle of the vector from 'start' to 'end' (in rad, like 'math.atan2').
+    """
+    return math.atan2(end[1] - start[1], end[0] - start[0])
+
+
+def _strictly_inside(point: Coordinates, polygon: List[Coordinates], scale=1) -> bool:
+    """
+    Crossing number test without divisions. 'point' must not lie on the boundary of 'polygon'.
+    :param point: the point multiplied by 'scale' (so that midpoints of integer segments can be tested with integers)
+    """
+    inside = False
+    x, y = point
+    for i in range(len(polygon)):
+        p, q = polygon[i-1], polygon[i]
+        py, qy = p[1] * scale, q[1] * scale
+        if (py > y) != (qy > y):
+            # is the point left of the intersection of the edge with the horizontal line through the point?
+            if ((x - p[0] * scale) * (q[1] - p[1]) < (y - py) * (q[0] - p[0])) == (q[1] > p[1]):
+                inside = not inside
+    return inside
+
+
+def polygons_overlap(polygon1: List[Coordinates], polygon2: List[Coordinates]) -> bool:
+    """
+    Determines if two simple polygons overlap or touch each other (their union is connected).
+    """
+    for i in range(len(polygon1)):
+        for j in range(len(polygon2)):
+            if _segment_intersections(polygon1[i-1], polygon1[i], polygon2[j-1], polygon2[j]):
+                return True
+    # the borders do not touch, so one polygon can only lie completely inside the other one
+    return _strictly_inside(polygon1[0], polygon2) or _strictly_inside(polygon2[0], polygon1)
+
+
+def polygon_union(polygons: List[List[Coordinates]], holes: bool = False) -> List[List[Coordinates]]:
+    """
+    Unites simple polygons. Candidate pairs of edges are found with a sweep along the x-axis, the edges are split at
+    all intersections and every part is kept if it does not lie inside another polygon. The remaining parts are linked
+    to closed boundaries.
+    :param polygons: list of simple polygons with exact coordinates (int or Fraction)
+    :param holes: Optional. If True, the boundaries of holes are returned as well (clockwise). Standard: holes are
+    not returned, because they can not be reached from outside.
+    :return: list of counter-clockwise polygons (and clockwise holes)
+    """
+    rings = [counter_clockwise(remove_collinear(polygon)) for polygon in polygons]
+    rings = [ring for ring in rings if len(ring) >= 3 and signed_area(ring) != 0]
+    boxes = [(min(p[0] for p in ring), min(p[1] for p in ring), max(p[0] for p in ring), max(p[1] for p in ring))
+             for ring in rings]
+    segments = [(ring_id, ring[i-1], ring[i]) for ring_id, ring in enumerate(rings) for i in range(len(ring))]
+    split_points = [{a, b} for _, a, b in segments]
+    # sweep: segments are sorted by their smallest x-coordinate, only segments whose x-ranges overlap are compared
+    bounds = [(min(a[0], b[0]), max(a[0], b[0]), min(a[1], b[1]), max(a[1], b[1])) for _, a, b in segments]
+    order = sorted(range(len(segments)), key=lambda k: bounds[k][0])
+    convex = [is_convex(ring) for ring in rings]
+    active = []
+    for k in order:
+        ring_id, a, b = segments[k]
+        min_x, _, min_y, max_y = bounds[k]
+        still_active = []
+        for other in active:
+            other_bounds = bounds[other]
+            if other_bounds[1] < min_x:
+                continue  # the sweep passed this segment
+            still_active.append(other)
+            if other_bounds[2] > max_y or other_bounds[3] < min_y:
+                continue  # y-ranges do not overlap
+            other_ring_id, c, d = segments[other]
+            if other_ring_id == ring_id and convex[ring_id]:
+                continue  # edges of a convex polygon only meet at their common vertices
+            for point in _segment_intersections(a, b, c, d):
+                split_points[k].add(point)
+                split_points[other].add(point)
+        still_active.append(k)
+        active = still_active
+    # split the segments, the parts refer to the points by their index in 'coordinates', because hashing tuples of
+    # Fractions is slow
+    point_ids = {}
+    parts = {}  # (start id, end id) -> set of ring ids
+    for (ring_id, a, b), points in zip(segments, split_points):
+        if len(points) == 2:
+            points = (a, b)  # most segments are not split
+        else:
+            direction = (b[0] - a[0], b[1] - a[1])
+            points = sorted(points, key=lambda p: (p[0] - a[0]) * direction[0] + (p[1] - a[1]) * direction[1])
+        ids = [point_ids.setdefault(point, len(point_ids)) for point in points]
+        for start, end in zip(ids, ids[1:]):
+            parts.setdefault((start, end), set()).add(ring_id)
+    coordinates = list(point_ids)
+    # classify the parts, the polygons which may contain a part are found with a grid over their bounding boxes
+    # the cells are as large as a typical polygon, so most polygons are only in a few cells
+    sizes = sorted(max(box[2] - box[0], box[3] - box[1]) for box in boxes)
+    cell_size = sizes[len(sizes) // 2] or 1
+    cells = {}
+    for ring_id, box in enumerate(boxes):
+        for column in range(int(box[0] // cell_size), int(box[2] // cell_size) + 1):
+            for row in range(int(box[1] // cell_size), int(box[3] // cell_size) + 1):
+                cells.setdefault((column, row), []).append(ring_id)
+    kept = []
+    for (start_id, end_id), ring_ids in parts.items():
+        if (end_id, start_id) in parts:
+            continue  # the polygons touch each other along this part, so it lies inside the union
+        start, end = coordinates[start_id], coordinates[end_id]
+        # the midpoint is multiplied by 'scale', so that it can be tested with integers only
+        x, y = start[0] + end[0], start[1] + end[1]
+        if type(x) is int and type(y) is int:
+            scale = 2
+            middle = (x, y)
+        else:
+            x, y = Fraction(x), Fraction(y)
+            scale = 2 * x.denominator * y.denominator // math.gcd(x.denominator, y.denominator)
+            middle = (int(x * scale) // 2, int(y * scale) // 2)
+        cell = (int(x / 2 // cell_size), int(y / 2 // cell_size))
+        if any(ring_id not in ring_ids and
+               scale * boxes[ring_id][0] <= middle[0] <= scale * boxes[ring_id][2] and
+               scale * boxes[ring_id][1] <= middle[1] <= scale * boxes[ring_id][3] and
+               _strictly_inside(middle, rings[ring_id], scale)
+               for ring_id in cells.get(cell, ())):
+            continue
+        kept.append((start_id, end_id))
+    # link the parts to closed boundaries
+    outgoing = {}
+    for part in kept:
+        outgoing.setdefault(part[0], []).append(part)
+    used = set()
+    result = []
+    for first in kept:
+        if first in used:
+            continue
+        boundary = [first[0]]
+        used.add(first)
+        current = first
+        while True:
+            candidates = [part for part in outgoing.get(current[1], []) if part not in used or part == first]
+            if not candidates:
+                boundary = None  # not closed
+                break
+            if len(candidates) == 1:
+                current = candidates[0]
+            else:
+                # take the first part clockwise from the reversed current part, so that the union stays on the left
+                back_angle = _angle(coordinates[current[1]], coordinates[current[0]])
+                current = min(candidates, key=lambda part: (back_angle - _angle(coordinates[part[0]],
+                                                                                coordinates[part[1]]))
+                              % (2 * math.pi) or 2 * math.pi)
+            if current == first:
+                break
+            used.add(current)
+            boundary.append(current[0])
+        if boundary is not None:
+            boundary = remove_collinear([coordinates[point_id] for point_id in boundary])
+            if len(boundary) >= 3 and (signed_area(boundary) > 0 or holes):
+                result.append(boundary)
+    return result
@@ -0,0 +1,98 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul stellt die Klasse 'MultiWaySearcher' bereit, die für viele Startpositionen (Häuser) auf derselben Karte
+den besten Weg findet. Der Sichtbarkeitsgraph der Hindernisse und die spätesten Zeiten aller Ecken werden nur einmal
+berechnet, für jede Anfrage ist dann nur noch ein Rotational Plane Sweep vom Startpunkt aus nötig.
+"""
+from typing import List, Iterable, Iterator, Tuple
+
+from way_searcher import *
+
+
+class MultiWaySearcher:
+    def __init__(self, polygons: List[Polygon], lisa_polygon: List[Point] = None,
+                 bus_speed: float = 30/3.6, lisa_speed: float = 15/3.6, **graph_options):
+        """
+        Creates the visibility graph of the obstacles (without Lisa's house) and calculates for every Node the latest
+        time to leave it with a Dijkstra-Algorithm which is not stopped early.
+        :param polygons: all obstacles
+        :param lisa_polygon: Optional. Lisa's polygon relative to her position (the obstacles must already be expanded)
+        :param bus_speed: Bus speed
+        :param lisa_speed: Lisa's speed
+        :param graph_options: options for 'WaySearcher.create_visibility_graph' (except 'lazy')
+        """
+        self.searcher = WaySearcher(polygons, None, lisa_polygon, bus_speed, lisa_speed)
+        self.searcher.create_visibility_graph(**graph_options)
+        nodes = self.searcher.nodes
+        if self.searcher.compact_graph is not None:
+            self.times, self.parents = self.searcher.compact_graph.dijkstra(-1, lisa_speed)
+        else:
+            self.searcher._dijkstra_heap()  # there is no Lisa's house, so all Nodes are visited
+            node_ids = {node: i for i, node in enumerate(nodes)}
+            self.times = [node.last_time for node in nodes]
+            self.parents = [node_ids[node.parent] if node.parent is not None else -1 for node in nodes]
+        self.node_ids = {node: i for i, node in enumerate(nodes)}
+        self.y_rotation_angle = math.degrees(math.asin(lisa_speed / bus_speed))
+
+    @staticmethod
+    def from_str(text: str, bus_speed: float = 30/3.6, lisa_speed: float = 15/3.6, **graph_options) \
+            -> "MultiWaySearcher":
+        """
+        Creates a new MultiWaySearcher by the given string 'text' in the format described on the BwInf-Website. The
+        position of Lisa's house in the last line is ignored, but her polygon is used.
+        """
+        polygons, _, lisa_polygon = WaySearcher.parse(text)
+        return MultiWaySearcher(polygons, lisa_polygon, bus_speed, lisa_speed, **graph_options)
+
+    def query(self, x: float, y: float) -> Tuple[List[Node], float, float]:
+        """
+        Searches the best way from the house at (x|y) to the y-axis.
+        :return: way (list of Nodes from the house to the y-axis), length in meters, Lisa's time in seconds.
+        If there is no way, the way only contains the house, whose 'last_time' is -inf (like 'WaySearcher.dijkstra').
+        """
+        searcher = self.searcher
+        house = Node(x, y, polygon_id="L")
+        y_node = house.get_rotated_on_y_axis(self.y_rotation_angle)
+        y_node.last_time = y_node.y / searcher.bus_speed
+        lines = searcher._rotational_plane_sweep(house, searcher._all_nodes + [y_node], searcher._visible_targets,
+                                                 searcher._active_edges)
+        best_id = None
+        for line in lines:
+            time = y_node.last_time if line.p2 is y_node else self.times[self.node_ids[line.p2]]
+            time -= line.length / searcher.lisa_speed
+            if time > house.last_time:
+                house.last_time = time
+                best_id = -1 if line.p2 is y_node else self.node_ids[line.p2]
+        way = [house]
+        if best_id == -1:
+            way.append(y_node)
+        elif best_id is not None:
+            node_id = best_id
+            while node_id != -1:
+                node = searcher.nodes[node_id]
+                node.last_time = self.times[node_id]
+                node.parent = searcher.nodes[self.parents[node_id]] if self.parents[node_id] != -1 else None
+                way.append(node)
+                node_id = self.parents[node_id]
+            if searcher.bus_potential and way[-1].x != 0:
+                # the bus potential was used, so the Node on the y-axis was not created before
+                way[-1].parent = searcher.get_bus_node(way[-1])
+                way.append(way[-1].parent)
+        house.parent = way[1] if len(way) > 1 else None
+        length = sum(way[i].get_distance(way[i + 1]) for i in range(len(way) - 1))
+        return way, length, length / searcher.lisa_speed
+
+    def query_many(self, positions: Iterable[Tuple[float, float]]) -> Iterator[Tuple[List[Node], float, float]]:
+        """
+        Answers 'MultiWaySearcher.query' for every position and yields every result as soon as it is calculated.
+        :param positions: iterable of (x, y) tuples
+        """
+        for x, y in positions:
+            yield self.query(x, y)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Skript startet einen lokalen Server (HTTP auf localhost oder über einen Unix-Socket), der Anfragen nach Lisas
+Weg beantwortet. Für jede Karte und Geschwindigkeit wird ein 'MultiWaySearcher' einmal erstellt und in einem LRU-Cache
+behalten, sodass eine Anfrage nur noch einen Rotational Plane Sweep vom Haus aus braucht. Die Sichtbarkeitsgraphen
+werden in einem Thread-Pool erstellt und die Anfragen dort beantwortet, damit der Server währenddessen weitere
+Anfragen annehmen kann.
+
+Anfragen:
+    POST /route  {"map": "<Inhalt einer Datei>"} oder {"file": "<Dateiname relativ zu --data-dir>"},
+                 optional "x", "y" (Standard: Lisas Haus aus der Karte), "bus_speed", "lisa_speed" (in m/s)
+    GET  /stats  Größe des Caches, Treffer und Fehlschläge
+
+Dateien werden nur gelesen, wenn der Server mit --data-dir gestartet wurde, und nur innerhalb dieses Ordners.
+
+Aufruf: server.py [--host HOST] [--port PORT] [--unix PFAD] [--cache-size N] [--workers N] [--data-dir ORDNER]
+"""
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Tuple
+
+from geometry import to_number
+from multi_way_searcher import MultiWaySearcher
+from way_searcher import WaySearcher
+
+
+class GraphCache:
+    """
+    LRU cache of 'MultiWaySearcher's. A graph which is requested while it is built is only built once.
+    """
+
+    def __init__(self, max_size: int = 16, workers: int = None):
+        """
+        :param max_size: maximum number of cached graphs
+        :param workers: number of threads which build the graphs and answer the queries
+        """
+        self.max_size = max_size
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+        # key -> (MultiWaySearcher, Lisa's position from the map, lock for the queries)
+        self._entries = collections.OrderedDict()
+        self._building = {}  # key -> asyncio.Future of a graph which is built at the moment
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _build(text: str, bus_speed: float, lisa_speed: float) \
+            -> Tuple[MultiWaySearcher, Tuple[float, float], threading.Lock]:
+        polygons, lisa_node, lisa_polygon = WaySearcher.parse(text)
+        return MultiWaySearcher(polygons, lisa_polygon, bus_speed, lisa_speed), (lisa_node.x, lisa_node.y), \
+            threading.Lock()
+
+    async def get(self, text: str, bus_speed: float, lisa_speed: float) \
+            -> Tuple[MultiWaySearcher, tuple, threading.Lock, bool]:
+        """
+        :return: MultiWaySearcher for the map 'text' and the speeds, Lisa's position from the map, a lock which must be
+        held while the MultiWaySearcher is queried (its queries change the 'last_time' and 'parent' of shared Nodes),
+        True if it was cached
+        """
+        key = (hashlib.sha256(text.encode()).hexdigest(), bus_speed, lisa_speed)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key] + (True,)
+        self.misses += 1
+        if key not in self._building:
+            loop = asyncio.get_running_loop()
+            self._building[key] = loop.run_in_executor(self.executor, self._build, text, bus_speed, lisa_speed)
+        try:
+            entry = await asyncio.shield(self._building[key])
+        finally:
+            self._building.pop(key, None)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry + (False,)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "max_size": self.max_size, "building": len(self._building),
+                "hits": self.hits, "misses": self.misses}
+
+
+def read_map_file(data_dir: str, name: str) -> str:
+    """
+    Reads a map file for a route query. Only files in 'data_dir' (or its subdirectories) can be read.
+    :param data_dir: directory of the map files, None if files must not be read
+    :param name: file name relative to 'data_dir'
+    """
+    if data_dir is None:
+        raise ValueError("reading files is disabled (start the server with --data-dir)")
+    root = os.path.realpath(data_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("'{}' is not in the data directory".format(name))
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _query(searcher: MultiWaySearcher, lock: threading.Lock, x: float, y: float) -> dict:
+    """
+    Queries the way from (x|y) and converts it to the response (runs in the thread pool of 'GraphCache').
+    """
+    with lock:
+        t1 = time.perf_counter()
+        way, way_length, way_time = searcher.query(x, y)
+        found = way[0].last_time != -math.inf
+        return {
+            "found": found,
+            "start_time": way[0].last_time if found else None,  # seconds relative to 7:30
+            "length": way_length,
+            "duration": way_time,
+            "way": [[to_number(node.x), to_number(node.y), node.polygon_id] for node in way],
+            "timings": {"query": time.perf_counter() - t1}
+        }
+
+
+async def route(cache: GraphCache, request: dict, data_dir: str = None) -> dict:
+    """
+    Answers a route query (see the module docstring).
+    :param data_dir: Optional. Directory from which "file" requests are read, if None, only "map" requests are answered
+    """
+    loop = asyncio.get_running_loop()
+    if "map" in request:
+        text = request["map"]
+    else:
+        text = await loop.run_in_executor(cache.executor, read_map_file, data_dir, request["file"])
+    bus_speed = float(request.get("bus_speed", 30/3.6))
+    lisa_speed = float(request.get("lisa_speed", 15/3.6))
+    t1 = time.perf_counter()
+    searcher, lisa_position, lock, cached = await cache.get(text, bus_speed, lisa_speed)
+    t2 = time.perf_counter()
+    x = to_number(request.get("x", lisa_position[0]))
+    y = to_number(request.get("y", lisa_position[1]))
+    response = await loop.run_in_executor(cache.executor, _query, searcher, lock, x, y)
+    response["cached"] = cached
+    response["timings"]["graph"] = t2 - t1
+    return response
+
+
+async def handle_connection(cache: GraphCache, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            data_dir: str = None):
+    """
+    Reads one HTTP request and sends the JSON response. The connection is closed afterwards.
+    :param data_dir: Optional. See 'route'
+    """
+    status, response = 200, None
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        if len(request_line) < 2:
+            status, response = 400, {"error": "invalid request"}
+        elif request_line[0] == "GET" and request_line[1] == "/stats":
+            response = cache.stats()
+        elif request_line[0] == "POST" and request_line[1] == "/route":
+            response = await route(cache, json.loads(body or b"{}"), data_dir)
+        else:
+            status, response = 404, {"error": "unknown request '{}'".format(" ".join(request_line[:2]))}
+    except (ValueError, KeyError, OSError) as e:
+        status, response = 400, {"error": "{}: {}".format(type(e).__name__, e)}
+    except Exception as e:
+        status, response = 500, {"error": "{}: {}".format(type(e).__name__, e)}
+    data = json.dumps(response).encode()
+    reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+    writer.write("HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: close\r\n\r\n"
+                 .format(status, reasons[status], len(data)).encode("latin-1") + data)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8037, unix_path: str = None, cache_size: int = 16,
+                workers: int = None, data_dir: str = None):
+    """
+    Starts the server and runs until it is cancelled.
+    :param unix_path: Optional. If given, the server listens on this Unix socket instead of 'host' and 'port'.
+    :param data_dir: Optional. Directory from which "file" requests are read, if None, they are rejected
+    """
+    cache = GraphCache(cache_size, workers)
+
+    async def handler(reader, writer):
+        await handle_connection(cache, reader, writer, data_dir)
+
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(handler, unix_path)
+    else:
+        server = await asyncio.start_server(handler, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        cache.executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answers route queries with cached visibility graphs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8037)
+    parser.add_argument("--unix", default=None, help="path of a Unix socket (instead of host and port)")
+    parser.add_argument("--cache-size", type=int, default=16, help="maximum number of cached graphs")
+    parser.add_argument("--workers", type=int, default=None, help="number of threads which build graphs and answer "
+                                                                      "queries")
+    parser.add_argument("--data-dir", default=None,
+                        help="directory of the map files for 'file' requests (standard: 'file' requests are rejected)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.cache_size, args.workers, args.data_dir))
+    except KeyboardInterrupt:
+        pass
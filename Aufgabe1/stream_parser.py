@@ -0,0 +1,115 @@
+"""
+Geschrieben für die 2. Runde des 37. Bundeswettbewerb Informatik
+Autor: Florian Rädiker
+Teilnahme-ID: 48302
+
+Aufgabe 1: Lisa rennt
+
+WRITTEN IN PYTHON3
+
+Dieses Modul liest Dateien im Format der BwInf-Website Zeile für Zeile, ohne den ganzen Text im Speicher zu halten. Die
+Koordinaten aller Polygone werden direkt in ein Array geschrieben ('ScenarioArrays'), die 'Polygon'-Objekte werden erst
+danach erzeugt, weil Lisas Polygon (für die Minkowski-Summe) erst in der letzten Zeile steht.
+"""
+import os
+from array import array
+from typing import Callable, Iterator, List
+
+from geometry import *
+
+
+class ScenarioArrays:
+    """
+    Contents of a scenario file in compact arrays: the coordinates of polygon i are
+    coordinates[offsets[i]:offsets[i + 1]] (x1, y1, x2, y2, ...).
+    """
+
+    def __init__(self):
+        self.coordinates = array("q")
+        self.offsets = array("q", [0])
+        self.lisa_position = None  # (x, y)
+        self.lisa_polygon = None  # coordinates relative to Lisa's position (x1, y1, x2, y2, ...) or None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def polygon_coordinates(self, i: int) -> array:
+        return self.coordinates[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_lisa_node(self) -> Node:
+        return Node(self.lisa_position[0], self.lisa_position[1], polygon_id="L")
+
+    def get_lisa_polygon(self) -> List[Point]:
+        if self.lisa_polygon is None:
+            return None
+        coordinates = self.lisa_polygon
+        return [Point(coordinates[i], coordinates[i + 1]) for i in range(0, len(coordinates), 2)]
+
+    def polygons(self, minkowski: str = "exact") -> Iterator[Polygon]:
+        """
+        Creates the polygons (expanded by Lisa's polygon, see 'Polygon.from_str') one after another.
+        """
+        lisa_polygon = self.get_lisa_polygon()
+        coordinates, offsets = self.coordinates, self.offsets
+        for i in range(len(self)):
+            vertices = [Node(coordinates[j], coordinates[j + 1]) for j in range(offsets[i], offsets[i + 1], 2)]
+            yield Polygon(vertices, i + 1, lisa_polygon, minkowski)
+
+
+def read_scenario(path: str, progress: Callable[[int, int], None] = None, progress_step: int = 1 << 20) \
+        -> ScenarioArrays:
+    """
+    Reads a file in the format described on the BwInf-Website line by line. Like 'WaySearcher.parse', lines starting
+    with '#' and the first line (count of polygons) are ignored, empty lines are ignored as well.
+    :param path: file name
+    :param progress: Optional. Called with (bytes read, file size) about every 'progress_step' bytes and at the end
+    :param progress_step: Optional. See 'progress'
+    :return: ScenarioArrays with the coordinates of all polygons and Lisa's position and polygon
+    """
+    total = os.path.getsize(path)
+    scenario = ScenarioArrays()
+    coordinates, offsets = scenario.coordinates, scenario.offsets
+    first_line = True
+    last_line = None  # the last line contains Lisa's position, so every line is stored until the next one is read
+    line_number = 0
+    bytes_read = 0
+    next_report = progress_step
+    with open(path, "rb") as f:
+        for line in f:
+            line_number += 1
+            bytes_read += len(line)
+            if progress is not None and bytes_read >= next_report:
+                progress(bytes_read, total)
+                next_report = bytes_read + progress_step
+            if line.startswith(b"#") or not line.strip():
+                continue
+            if first_line:
+                first_line = False  # first line containing count of polygons is ignored
+                continue
+            if last_line is not None:
+                _add_polygon(coordinates, offsets, *last_line)
+            last_line = (line, line_number)
+    if last_line is None:
+        raise ValueError("'{}' does not contain Lisa's position".format(path))
+    numbers = array("q", map(int, last_line[0].split()))
+    scenario.lisa_position = (numbers[0], numbers[1])
+    if len(numbers) > 2:
+        if len(numbers) != numbers[2] * 2 + 3:
+            raise ValueError("line {}: expected {} vertices of Lisa's polygon".format(last_line[1], numbers[2]))
+        scenario.lisa_polygon = array("q", (numbers[i] - numbers[(i - 3) % 2] for i in range(3, len(numbers))))
+    if progress is not None:
+        progress(bytes_read, total)
+    return scenario
+
+
+def _add_polygon(coordinates: array, offsets: array, line: bytes, line_number: int):
+    """
+    Appends the coordinates of the line "n x1 y1 x2 y2 ... xn yn" to 'coordinates'.
+    """
+    start = len(coordinates)
+    tokens = line.split()
+    coordinates.extend(map(int, tokens[1:]))
+    if len(coordinates) - start != int(tokens[0]) * 2:
+        del coordinates[start:]
+        raise ValueError("line {}: expected {} vertices".format(line_number, int(tokens[0])))
+    offsets.append(len(coordinates))
@@ -11,8 +11,12 @@ WRITTEN IN PYTHON3
 Hauptbestandteil dieses Moduls ist die Klasse 'WaySearcher', die durch Rotational Plane Sweep und den Dijkstra-
 Algorithmus den kürzesten Weg findet.
 """
-from typing import List
+from typing import List, Iterable, Tuple
+from array import array
 import itertools
+import heapq
+import hashlib
+import concurrent.futures
 
 import os
 import sys
@@ -22,6 +26,11 @@ site_packages = os.path.join(cwd, "./site-packages/")  # site-packages directory
 sys.path.append(site_packages)
 
 from geometry import *
+from active_edges import ActiveEdges
+from angular_sort import AngularSorter, sort_by_angle
+from compact_graph import CompactGraph, get_way_ids
+from stream_parser import read_scenario
+from instrumentation import Instrumentation, TrackedActiveEdges, TrackedSet, instrumented_phase
 
 import svgwrite.shapes
 import svgwrite.text
@@ -35,23 +44,37 @@ class WaySearcher:
         Initializes a WaySearcher.
         :param edges: All the obstacle's edges in the area
         :param points: All the obstacle's vertices and Lisa's Node
-        :param lisa_node: Node of Lisa's house
+        :param lisa_node: Node of Lisa's house. May be None to create the visibility graph of the obstacles only (see
+        'MultiWaySearcher').
         :param bus_speed: Bus speed
         :param lisa_speed: Lisa's speed
         """
         self.polygons = polygons
         self.lisa_node = lisa_node
         self.lisa_polygon = lisa_polygon
-        self.edges = list(itertools.chain(*(p.edges for p in self.polygons)))
         self.nodes = list(itertools.chain(*(p.points for p in self.polygons)))
-        self.nodes.append(self.lisa_node)
+        if self.lisa_node is not None:
+            self.nodes.append(self.lisa_node)
         self.bus_speed = bus_speed
         self.lisa_speed = lisa_speed
         self.created_vis_graph = False  # set to True when visibility graph was generated by 'create_visibility_graph'
+        self._create_edge_index()
         self.vis_graph_lines = set()  # vis_graph_lines are only used for the svg graphic
+        self.compact_graph = None  # 'CompactGraph', if the visibility graph was created with 'compact=True'
+        self.lazy = False  # set to True when the rotational plane sweeps are done on demand during the search
+        self.bus_potential = False  # set to True when the bus is reached without Nodes on the y-axis
+        self._all_nodes = None  # Nodes and settings of 'create_visibility_graph' for later sweeps
+        self._visible_targets = None
+        self._active_edges = "set"
+        self._check_overlapping_polygons = True
+        self._prune_reflex = True
+        self._reduced = False
+        self.expanded_nodes = None  # number of Nodes expanded by the last search ('dijkstra')
+        self.instrumentation = None  # 'Instrumentation' if enabled by 'enable_instrumentation'
 
     @staticmethod
-    def from_str(text: str, bus_speed: float = 30/3.6, lisa_speed: float = 15/3.6) -> "WaySearcher":
+    def from_str(text: str, bus_speed: float = 30/3.6, lisa_speed: float = 15/3.6, minkowski: str = "exact") \
+            -> "WaySearcher":
         """
         Creates a new WaySearcher by the given string 'text' in the format described on the BwInf-Website.
         All lines starting with '#' are ignored, so you may use them as comments in your file.
@@ -60,8 +83,33 @@ class WaySearcher:
         :param text: string in the format described on the BwInf-Website
         :param bus_speed: Optional. In meters per second. Standard: 30/3.6 m/s (30 km/h)
         :param lisa_speed: Optional. In meters per second. Standard: 15/3.6 m/s (15 km/h)
+        :param minkowski: Optional. Method to expand the obstacles by Lisa's polygon (see 'Polygon.__init__')
         :return: initialized WaySearcher-object
         """
+        polygons, lisa_node, lisa_polygon = WaySearcher.parse(text, minkowski)
+        return WaySearcher(polygons, lisa_node, lisa_polygon, bus_speed, lisa_speed)
+
+    @staticmethod
+    def from_file(path: str, bus_speed: float = 30/3.6, lisa_speed: float = 15/3.6, minkowski: str = "exact",
+                  progress=None) -> "WaySearcher":
+        """
+        Creates a new WaySearcher by the file 'path' (see 'WaySearcher.from_str'). The file is read line by line into
+        compact arrays ('stream_parser.read_scenario'), so large files are never kept in memory as a whole.
+        :param progress: Optional. Called with (bytes read, file size) while the file is read
+        :return: initialized WaySearcher-object
+        """
+        scenario = read_scenario(path, progress)
+        return WaySearcher(list(scenario.polygons(minkowski)), scenario.get_lisa_node(), scenario.get_lisa_polygon(),
+                           bus_speed, lisa_speed)
+
+    @staticmethod
+    def parse(text: str, minkowski: str = "exact"):
+        """
+        Parses the string 'text' in the format described on the BwInf-Website (see 'WaySearcher.from_str').
+        :param text: string in the format described on the BwInf-Website
+        :param minkowski: Optional. Method to expand the obstacles by Lisa's polygon (see 'Polygon.__init__')
+        :return: tuple (polygons, Lisa's Node, Lisa's polygon relative to her Node or None)
+        """
         lines = [line for line in text.split("\n") if not line.startswith("#")]  # filter all lines with '#'
         numbers_last = [int(i) for i in lines[-1].split(" ")]
         lisa_node = Node(numbers_last[0], numbers_last[1], polygon_id="L")
@@ -75,9 +123,8 @@ class WaySearcher:
             lisa_polygon = None
         polygons = []
         for polygon_id, line in enumerate(lines[1:-1], 1):  # first line containing count of polygons is ignored
-            polygons.append(Polygon.from_str(line, polygon_id, lisa_polygon))
-
-        return WaySearcher(polygons, lisa_node, lisa_polygon, bus_speed, lisa_speed)
+            polygons.append(Polygon.from_str(line, polygon_id, lisa_polygon, minkowski))
+        return polygons, lisa_node, lisa_polygon
 
     def __repr__(self):
         return """WaySearcher(
@@ -104,7 +151,8 @@ class WaySearcher:
             max(node.y for node in self.nodes) + border  # the y-points are always 30° above the last obstacle
                                                          # vertex, so only y-points can have the greatest y-coordinate
         )
-        for polygon in self.polygons:
+        # merged polygons are drawn as the polygons they were created from
+        for polygon in itertools.chain(*(polygon.merged_polygons or [polygon] for polygon in self.polygons)):
             if polygon.small_polygons:
                 group.add(svgwrite.shapes.Polygon((point.to_tuple() for point in polygon.original_points),
                                                   stroke="black", fill="yellow", stroke_width="2"))
@@ -127,10 +175,16 @@ class WaySearcher:
             group.add(
                 svgwrite.shapes.Line(line.p1.to_tuple(), line.p2.to_tuple(), stroke="red", stroke_width="0.5")
             )
+        if self.compact_graph is not None:
+            for p1, p2 in self.compact_graph.segments():
+                group.add(svgwrite.shapes.Line(Point(*p1).to_tuple(), Point(*p2).to_tuple(),
+                                               stroke="red", stroke_width="0.5"))
         # HOUSE
-        group.add(
-            svgwrite.shapes.Circle(self.lisa_node.to_tuple(), 10, fill="#F42121", stroke="#000080", stroke_width="1")
-        )
+        if self.lisa_node is not None:
+            group.add(
+                svgwrite.shapes.Circle(self.lisa_node.to_tuple(), 10, fill="#F42121", stroke="#000080",
+                                       stroke_width="1")
+            )
         # WAY
         if way:
             group.add(
@@ -142,7 +196,7 @@ class WaySearcher:
                         svgwrite.shapes.Polygon((Point(vertex.x+point.x, vertex.y+point.y).to_tuple()
                                                  for vertex in self.lisa_polygon), fill="red", fill_opacity="0.5")
                     )
-        if self.lisa_polygon:
+        if self.lisa_polygon and self.lisa_node is not None:
             group.add(svgwrite.shapes.Polygon(
                 (((self.lisa_node.x + point.x), (self.lisa_node.y + point.y)) for point in
                  self.lisa_polygon), fill="blue"))
@@ -150,63 +204,624 @@ class WaySearcher:
         draw.add(group)
         draw.save(True)
 
-    def create_visibility_graph(self, check_overlapping_polygons=True):
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Collects counters and timings of all following phases (visibility graph, search, changes of the graph), see
+        'instrumentation.Instrumentation'. Only the calls of this WaySearcher are counted, other WaySearchers (e.g. in
+        other threads) are not affected. The rotational plane sweeps of worker processes ('workers' > 1) are not
+        counted.
+        :return: the Instrumentation, export it with 'Instrumentation.to_dict' or 'Instrumentation.to_json'
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        return self.instrumentation
+
+    def _create_edge_index(self):
+        """
+        Collects the edges of all polygons and creates the 'EdgeGrid' and the 'EdgeArray' for them.
+        """
+        self.edges = list(itertools.chain(*(p.edges for p in self.polygons)))
+        self.edge_grid = EdgeGrid(self.edges)
+        self.edge_array = EdgeArray(self.edges)
+        # the lowest y-coordinate of all edges (merged polygons can reach below the x-axis)
+        self._min_y = min(itertools.chain((0,), self.edge_array.y1, self.edge_array.y2))
+        # polygon and index in 'Polygon.edges' for every edge in self.edges
+        self._edge_owners = [(polygon, i) for polygon in self.polygons for i in range(len(polygon.edges))]
+
+    def in_other_polygon(self, point: Node) -> bool:
+        """
+        Determines if 'point' lies in any polygon except its own one ('Node.polygon').
+        Only the polygons with edges near the line from 'point' to the y-axis are tested.
+        """
+        stats = self.instrumentation
+        candidates = {}  # polygon -> indices of the edges of this polygon which can intersect the line to the y-axis
+        if stats is not None:
+            stats.count("edge_grid_queries")
+        for i in self.edge_grid.query_indices(LineSegment(point, Point(0, point.y))):
+            polygon, polygon_edge_id = self._edge_owners[i]
+            if polygon != point.polygon:
+                candidates.setdefault(polygon, []).append(polygon_edge_id)
+        point_in_polygon = Polygon.point_in_polygon if stats is None else \
+            stats.counted(Polygon.point_in_polygon, "point_in_polygon")
+        return any(point_in_polygon(polygon, point, indices) for polygon, indices in candidates.items())
+
+    def merge_polygons(self):
+        """
+        Merges all overlapping or touching polygons into one polygon each (see 'geometry.merge_overlapping_polygons'),
+        so that the edges and vertices inside other polygons are removed before the visibility graph is created.
+        """
+        if self.created_vis_graph:
+            raise ValueError("Polygons must be merged before the visibility graph is created")
+        self.polygons = merge_overlapping_polygons(self.polygons)
+        self.nodes = list(itertools.chain(*(p.points for p in self.polygons)))
+        if self.lisa_node is not None:
+            self.nodes.append(self.lisa_node)
+        self._create_edge_index()
+
+    @instrumented_phase("visibility_graph")
+    def create_visibility_graph(self, check_overlapping_polygons=True, active_edges: str = "set", lazy: bool = False,
+                                workers: int = 1, prune_reflex: bool = True, compact: bool = False,
+                                cache_dir: str = None, bus_potential: bool = False, merge_polygons: bool = False,
+                                reduced: bool = False):
+        """
+        Creates the visibility graph by doing a rotational plane sweep for every Node.
+        :param check_overlapping_polygons: Optional. If True (standard), Nodes which lie in other polygons are ignored.
+        :param active_edges: Optional. "set" (standard) tests every edge crossed by the sweep line (O(n² k) for k edges
+        crossed by the sweep line), "tree" keeps these edges ordered by their distance in a blocked sorted list (see
+        'ActiveEdges', O(log k) comparisons per change) and only tests the nearest one (Lee's algorithm, O(n² log n)).
+        "set" is faster if the sweep line crosses only few edges (like on typical maps), because the set is updated in
+        C, "tree" if it crosses many. "tree" requires that no two obstacle edges cross each other, otherwise a
+        ValueError is raised (the expanded polygons of maps with Lisa's polygon overlap, see 'merge_polygons').
+        :param lazy: Optional. If True, only the Nodes on the y-axis are created here. The rotational plane sweep for a
+        Node is done when 'dijkstra' chooses this Node and its result is stored in 'Node.neighbors'.
+        :param workers: Optional. If greater than 1, the rotational plane sweeps are split across this number of
+        processes. Ignored if 'lazy' is True.
+        :param prune_reflex: Optional. If True (standard), reflex vertices are neither used as origins nor as targets,
+        because shortest ways never bend at them. Set to False to verify results.
+        :param compact: Optional. If True, the visibility graph is only stored in 'WaySearcher.compact_graph' (arrays
+        instead of 'Node.neighbors' and 'WaySearcher.vis_graph_lines'). Can not be combined with 'lazy'.
+        :param cache_dir: Optional. If given, the compact visibility graph is loaded from this directory if it was
+        saved there for the same polygons, Lisa's position and speed ratio (see 'WaySearcher.get_graph_key'),
+        otherwise it is created and saved there. Implies 'compact'.
+        :param bus_potential: Optional. If True, no Nodes on the y-axis are created. Instead, the latest time to leave
+        every Node directly towards the bus is calculated and stored in 'Node.last_time' if the line to the y-axis is
+        free, so that the Dijkstra-Algorithm only runs on the obstacle vertices.
+        :param merge_polygons: Optional. If True, overlapping polygons are merged first (see 'merge_polygons'), so
+        that "tree" can be used for 'active_edges' as well. Groups of polygons whose union has a hole are not merged,
+        their edges still cross, and "tree" raises a ValueError then.
+        :param reduced: Optional. If True, only lines which are tangent to the polygons at both ends are kept (reduced
+        visibility graph, see 'WaySearcher._is_tangent'). Shortest ways only consist of such lines, so the result does
+        not change, but the graph is much smaller.
+        """
+        if active_edges not in ("set", "tree"):
+            raise ValueError("Unknown active edge structure '{}'".format(active_edges))
+        if merge_polygons:
+            self.merge_polygons()
+        if active_edges == "tree" and edges_cross(self.edges):
+            if merge_polygons:
+                raise ValueError("Some polygons could not be merged (their union has a hole) and their edges cross, "
+                                 "so 'tree' can not be used for 'active_edges'")
+            raise ValueError("Edges of the polygons cross, so 'tree' can not be used for 'active_edges' (try "
+                             "'merge_polygons')")
+        if cache_dir is not None:
+            compact = True
+        if lazy and compact:
+            raise ValueError("A lazy visibility graph can not be compact")
         all_nodes = self.nodes.copy()
         if check_overlapping_polygons:
-            nodes_outside_polygons = [point for point in self.nodes
-                                                if point == self.lisa_node or not any(polygon.point_in_polygon(point)
-                                                                                      for polygon in self.polygons
-                                                                                          if polygon != point.polygon)]
+            covered = points_in_other_polygons(self.nodes, self.polygons, self.instrumentation)
+            nodes_outside_polygons = [point for point, is_covered in zip(self.nodes, covered)
+                                      if point == self.lisa_node or not is_covered]
         else:
             nodes_outside_polygons = all_nodes
+        if prune_reflex:
+            nodes_outside_polygons = [point for point in nodes_outside_polygons if point.convex]
+        visible_targets = set(nodes_outside_polygons)
         y_rotation_angle = math.degrees(math.asin(self.lisa_speed/self.bus_speed))
-        for origin in nodes_outside_polygons:
-            # do ROTATIONAL PLANE SWEEP for every node
-            y_node = origin.get_rotated_on_y_axis(y_rotation_angle)
-
-            lines = sorted((LineSegment(origin, point) for point in all_nodes + [y_node] if point != origin),
-                           key=lambda segment: (segment.angle, segment.length))  # sort by segment.angle,
-                                                                                 # if equal, sort by segment.length
-            test_edges = set()  # all edges which must be tested with the current point
-            # precalculate test_edges
-            down = LineSegment(origin, Point(origin.x, 0))  # angle = 0° (start)
-            for edge in self.edges:
-                intersection = get_intersection(down, edge)
-                # when there is an intersection, but the intersection lies exactly on one end of the edge, then the
-                # x-coordinate must be greater than the intersection, because only in this case the edge will be
-                # on the counter-clockwise side of the counter-clockwise rotating line and therefore be important.
-                # Otherwise, the edge would cause irritation later (see the documentation for further details).
-                if intersection is not None and \
-                    ((not intersection.has_same_point(edge.p1) or intersection.x >= edge.p2.x) and
-                     (not intersection.has_same_point(edge.p2) or intersection.x >= edge.p1.x)):
-                    test_edges.add(edge)
-            for line in lines:
-                # check all relevant edges
-                if line.p2 in nodes_outside_polygons or line.p2.x == 0:
-                    for edge in test_edges:
-                        if get_intersection(edge, line) is not None:
-                            break  # there is an intersection
+        self.bus_potential = bus_potential
+        self._all_nodes = all_nodes
+        self._visible_targets = visible_targets
+        self._active_edges = active_edges
+        self._check_overlapping_polygons = check_overlapping_polygons
+        self._prune_reflex = prune_reflex
+        self._reduced = reduced
+        if cache_dir is not None:
+            # the attributes above are set for a loaded graph as well, because 'MultiWaySearcher' and
+            # 'set_speeds' use them
+            cache_path = os.path.join(cache_dir, self.get_graph_key(check_overlapping_polygons, active_edges,
+                                                                    prune_reflex, bus_potential, reduced) + ".visgraph")
+            if self._load_compact_graph(cache_path):
+                self.created_vis_graph = True
+                return
+        if lazy:
+            self.lazy = True
+            for origin in nodes_outside_polygons:
+                # only the line to the y-axis is checked, all other lines are checked on demand
+                if bus_potential:
+                    origin.last_time = self._get_bus_potential(origin)
+                    continue
+                self._create_y_node(origin, y_rotation_angle)
+            self.created_vis_graph = True
+            return
+        if workers > 1:
+            sweeps = self._sweep_parallel(all_nodes, nodes_outside_polygons, y_rotation_angle, active_edges, workers,
+                                          not bus_potential)
+        else:
+            sweeps = self._sweep_sequential(all_nodes, nodes_outside_polygons, y_rotation_angle, active_edges,
+                                            not bus_potential)
+        if compact:
+            node_ids = {node: i for i, node in enumerate(all_nodes)}
+            pair_targets = array("q")
+            pair_sources = array("q")
+        for origin, y_node, lines in sweeps:
+            if y_node is None:
+                origin.last_time = self._get_bus_potential(origin)
+            if compact:
+                origin_id = node_ids[origin]
+                for line in lines:
+                    if line.p2 is y_node:
+                        # y_node is added to self.nodes below
+                        pair_targets.append(len(self.nodes))
+                        y_node.neighbors.append(origin)
                     else:
-                        if line.p1.polygon_id != line.p2.polygon_id or \
-                            line.p1.polygon is None or line.p2.polygon is None or \
-                            line.p2 in line.p1.polygon_neighbors or \
-                            not line.p1.polygon.point_in_polygon(
-                                Point((line.p1.x + line.p2.x) / 2, (line.p1.y + line.p2.y) / 2)):
-                            # line.p2 is visible from origin because the loop did not break,
-                            # so connect the two points and add the line to the visibility graph
-                            line.p2.neighbors.append(line.p1)
-                            self.vis_graph_lines.add(line)
-                test_edges ^= line.p2.edges  # all edges which are in line.p2.edges and not in
-                                             # test_edges are added, all others removed
-            if y_node.neighbors:
+                        pair_targets.append(node_ids[line.p2])
+                    pair_sources.append(origin_id)
+            else:
+                for line in lines:
+                    # connect the two points and add the line to the visibility graph
+                    line.p2.neighbors.append(line.p1)
+                    self.vis_graph_lines.add(line)
+            if y_node is not None and y_node.neighbors:
                 y_node.last_time = y_node.y / self.bus_speed
                 self.nodes.append(y_node)
+        if compact:
+            self.compact_graph = CompactGraph.from_pairs(self.nodes, self.edges, pair_targets, pair_sources)
+            for node in self.nodes[len(all_nodes):]:
+                node.neighbors = []  # the neighbors of the y-axis Nodes are only stored in the compact graph
+            if cache_dir is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                self.compact_graph.save(cache_path + ".tmp")
+                os.replace(cache_path + ".tmp", cache_path)  # other processes never see an incomplete file
         self.created_vis_graph = True
 
-    def dijkstra(self):
+    def get_graph_key(self, check_overlapping_polygons=True, active_edges: str = "set", prune_reflex: bool = True,
+                      bus_potential: bool = False, reduced: bool = False) -> str:
+        """
+        Calculates a hash of everything the visibility graph depends on: the polygons, Lisa's position and polygon,
+        the ratio of the speeds and the options of 'create_visibility_graph'.
+        :return: hexadecimal SHA-256 hash
+        """
+        data = (
+            CompactGraph.FILE_VERSION,
+            [(polygon.polygon_id, [(point.x, point.y) for point in polygon.original_points])
+             for polygon in self.polygons],
+            (self.lisa_node.x, self.lisa_node.y) if self.lisa_node is not None else None,
+            [(point.x, point.y) for point in self.lisa_polygon] if self.lisa_polygon else None,
+            self.lisa_speed / self.bus_speed,
+            (bool(check_overlapping_polygons), active_edges, bool(prune_reflex), bool(bus_potential), bool(reduced))
+        )
+        return hashlib.sha256(repr(data).encode()).hexdigest()
+
+    def _load_compact_graph(self, path: str) -> bool:
+        """
+        Loads a compact visibility graph saved by 'create_visibility_graph' and creates the Nodes on the y-axis.
+        :return: True if the graph was loaded, False if there is no matching graph
+        """
+        try:
+            graph = CompactGraph.load(path)
+        except (OSError, ValueError):
+            return False
+        if len(graph) < len(self.nodes) or \
+                any(graph.xs[i] != node.x or graph.ys[i] != node.y for i, node in enumerate(self.nodes)):
+            return False
+        for i in range(len(self.nodes), len(graph)):
+            y_node = Node(graph.xs[i], graph.ys[i])
+            y_node.last_time = graph.start_times[i]
+            self.nodes.append(y_node)
+        self.compact_graph = graph
+        return True
+
+    @instrumented_phase("add_polygon")
+    def add_polygon(self, polygon: Polygon):
+        """
+        Adds an obstacle to an existing visibility graph. Only the lines which cross the bounding box of the polygon
+        are tested again, and rotational plane sweeps are only done for the new vertices.
+        The graph must have been created by 'create_visibility_graph' without 'lazy' and 'compact'.
+        :param polygon: the new polygon (already expanded by Lisa's polygon, see 'Polygon.from_str')
+        """
+        self._check_incremental()
+        if self._active_edges == "tree" and edges_cross(self.edges + polygon.edges):
+            raise ValueError("The edges of the new polygon cross other edges, so it can not be added to a visibility "
+                             "graph created with 'tree' for 'active_edges'")
+        box = polygon.bounding_box
+        self.polygons.append(polygon)
+        self._create_edge_index()
+        self._all_nodes.extend(polygon.points)
+        self.nodes.extend(polygon.points)
+        # Nodes which are covered by the new polygon are not visible anymore
+        stats = self.instrumentation
+        covered = set()
+        if self._check_overlapping_polygons:
+            point_in_polygon = polygon.point_in_polygon if stats is None else \
+                stats.counted(polygon.point_in_polygon, "point_in_polygon")
+            covered = {node for node in self._visible_targets
+                       if node is not self.lisa_node and segment_intersects_box(node, node, box) and
+                       point_in_polygon(node)}
+        self._disconnect(covered)
+        # lines which cross the new polygon are removed
+        new_edges = EdgeArray(polygon.edges)
+        crossings = new_edges.crossings if stats is None else \
+            stats.counted(new_edges.crossings, "edge_array_crossings")
+
+        def is_blocked(node1, node2):
+            return segment_intersects_box(node1, node2, box) and bool(crossings(LineSegment(node1, node2)))
+
+        for node in self.nodes:
+            node.neighbors = [neighbor for neighbor in node.neighbors if not is_blocked(node, neighbor)]
+        self.vis_graph_lines = {line for line in self.vis_graph_lines
+                                if line.p1 not in covered and line.p2 not in covered and
+                                not is_blocked(line.p1, line.p2)}
+        self._remove_unused_y_nodes()
+        # sweeps from the new vertices
+        new_origins = [node for node in polygon.points if self._is_possible_target(node)]
+        self._visible_targets.update(new_origins)
+        for origin in new_origins:
+            self._connect_new_origin(origin, set(new_origins))
+        self.reset_search()
+
+    @instrumented_phase("remove_polygon")
+    def remove_polygon(self, polygon: Polygon):
+        """
+        Removes an obstacle from an existing visibility graph. Only the pairs of Nodes whose line crosses the bounding
+        box of the polygon are tested again, and rotational plane sweeps are only done for Nodes which were covered by
+        the polygon.
+        The graph must have been created by 'create_visibility_graph' without 'lazy' and 'compact'.
+        :param polygon: a polygon of 'WaySearcher.polygons'
+        """
+        self._check_incremental()
+        box = polygon.bounding_box
+        removed = set(polygon.points)
+        self._disconnect(removed)
+        self.polygons.remove(polygon)
+        self._create_edge_index()
+        self._all_nodes = [node for node in self._all_nodes if node not in removed]
+        self.nodes = [node for node in self.nodes if node not in removed]
+        self.vis_graph_lines = {line for line in self.vis_graph_lines
+                                if line.p1 not in removed and line.p2 not in removed}
+        self._remove_unused_y_nodes()
+        # Nodes which were covered by the removed polygon
+        freed = [node for node in self._all_nodes
+                 if node not in self._visible_targets and segment_intersects_box(node, node, box) and
+                 self._is_possible_target(node)]
+        # pairs of the other Nodes which could see each other through the removed polygon
+        old_targets = [node for node in self._all_nodes if node in self._visible_targets]
+        neighbor_sets = {node: set(node.neighbors) for node in old_targets}
+        for i, node1 in enumerate(old_targets):
+            for node2 in old_targets[i + 1:]:
+                if node2 not in neighbor_sets[node1] and segment_intersects_box(node1, node2, box):
+                    line = LineSegment(node1, node2)
+                    if self._is_line_free(line) and self._is_outside_own_polygon(line) and \
+                            (not self._reduced or (self._is_tangent(node1, node2) and self._is_tangent(node2, node1))):
+                        node1.neighbors.append(node2)
+                        node2.neighbors.append(node1)
+                        self.vis_graph_lines.add(line)
+        if not self.bus_potential:
+            # lines to the y-axis which crossed the removed polygon
+            base_nodes = set(self._all_nodes)
+            y_origins = {node.neighbors[0] for node in self.nodes if node not in base_nodes}
+            for origin in old_targets:
+                if origin not in y_origins:
+                    y_node = origin.get_rotated_on_y_axis(math.degrees(math.asin(self.lisa_speed/self.bus_speed)))
+                    line = LineSegment(origin, y_node)
+                    if segment_intersects_box(origin, y_node, box) and self._is_line_free(line) and \
+                            (not self._reduced or self._is_tangent(origin, y_node)):
+                        y_node.neighbors.append(origin)
+                        self.vis_graph_lines.add(line)
+                        self.nodes.append(y_node)
+        self._visible_targets.update(freed)
+        for origin in freed:
+            self._connect_new_origin(origin, set(freed))
+        self.reset_search()
+
+    def reset_search(self):
+        """
+        Resets 'Node.last_time' and 'Node.parent' of all Nodes, so that 'dijkstra' can be called again.
+        """
+        base_nodes = set(self._all_nodes)
+        for node in self.nodes:
+            node.parent = None
+            if node not in base_nodes:
+                node.last_time = node.y / self.bus_speed  # Node on the y-axis
+            elif self.bus_potential and node in self._visible_targets:
+                node.last_time = self._get_bus_potential(node)
+            else:
+                node.last_time = -math.inf
+
+    @instrumented_phase("set_speeds")
+    def set_speeds(self, bus_speed: float, lisa_speed: float):
+        """
+        Changes the speeds of an existing visibility graph. The lines between the obstacles do not depend on the speeds,
+        only the Nodes on the y-axis (or the bus potentials) are created again.
+        The graph must have been created by 'create_visibility_graph' without 'compact'.
+        :param bus_speed: Bus speed
+        :param lisa_speed: Lisa's speed
+        """
+        if not self.created_vis_graph or self.compact_graph is not None:
+            raise ValueError("The speeds can only be changed for a visibility graph which is not compact")
+        base_nodes = set(self._all_nodes)
+        self.nodes = [node for node in self.nodes if node in base_nodes]
+        self.vis_graph_lines = {line for line in self.vis_graph_lines if line.p2 in base_nodes}
+        self.bus_speed = bus_speed
+        self.lisa_speed = lisa_speed
+        if not self.bus_potential:
+            y_rotation_angle = math.degrees(math.asin(lisa_speed/bus_speed))
+            for origin in self._all_nodes:
+                if origin in self._visible_targets:
+                    self._create_y_node(origin, y_rotation_angle)
+        self.reset_search()
+
+    def solve_speeds(self, speeds: Iterable[Tuple[float, float]], engine: str = "heap") \
+            -> List[Tuple[List[Node], float, float]]:
+        """
+        Searches the best way for every pair of speeds with the same visibility graph (see 'WaySearcher.set_speeds').
+        Afterwards, the speeds of the last pair are set.
+        The Nodes of the graph are reused by every search, so every way consists of copies (see 'WaySearcher._copy_way')
+        whose 'last_time' and 'parent' belong to the speeds of this way.
+        :param speeds: iterable of (bus_speed, lisa_speed) tuples
+        :param engine: Optional. See 'WaySearcher.dijkstra'
+        :return: for every pair of speeds the result of 'WaySearcher.dijkstra'
+        """
+        results = []
+        for bus_speed, lisa_speed in speeds:
+            self.set_speeds(bus_speed, lisa_speed)
+            way, way_length, way_time = self.dijkstra(engine)
+            results.append((self._copy_way(way), way_length, way_time))
+        return results
+
+    @staticmethod
+    def _copy_way(way: List[Node]) -> List[Node]:
+        """
+        Copies the Nodes of a way (coordinates, polygon, 'last_time' and 'parent'), so that later searches do not change
+        them. The copies have no neighbors.
+        """
+        copies = []
+        for node in way:
+            copy = Node(node.x, node.y, polygon_id=node.polygon_id)
+            copy.polygon = node.polygon
+            copy.convex = node.convex
+            copy.last_time = node.last_time
+            if copies:
+                copies[-1].parent = copy
+            copies.append(copy)
+        return copies
+
+    def _create_y_node(self, origin: Node, y_rotation_angle: float):
+        """
+        Creates the Node on the y-axis for 'origin' and adds it to the visibility graph if the line to it is free.
+        """
+        y_node = origin.get_rotated_on_y_axis(y_rotation_angle)
+        line = LineSegment(origin, y_node)
+        if self._is_line_free(line) and (not self._reduced or self._is_tangent(origin, y_node)):
+            y_node.neighbors.append(origin)
+            y_node.swept = True
+            self.vis_graph_lines.add(line)
+            y_node.last_time = y_node.y / self.bus_speed
+            self.nodes.append(y_node)
+
+    def _check_incremental(self):
+        if not self.created_vis_graph or self.lazy or self.compact_graph is not None:
+            raise ValueError("Polygons can only be added to or removed from a complete visibility graph which is not "
+                             "compact")
+
+    def _is_possible_target(self, node: Node) -> bool:
+        """
+        Determines if 'node' can be part of the visibility graph (see 'create_visibility_graph').
+        """
+        if node is self.lisa_node:
+            return True
+        if self._check_overlapping_polygons and self.in_other_polygon(node):
+            return False
+        return not self._prune_reflex or node.convex
+
+    def _disconnect(self, nodes: set):
+        """
+        Removes all lines from and to the given Nodes from the visibility graph.
+        """
+        for node in self.nodes:
+            if node in nodes:
+                node.neighbors = []
+            elif any(neighbor in nodes for neighbor in node.neighbors):
+                node.neighbors = [neighbor for neighbor in node.neighbors if neighbor not in nodes]
+        self._visible_targets.difference_update(nodes)
+
+    def _remove_unused_y_nodes(self):
+        base_nodes = set(self._all_nodes)
+        self.nodes = [node for node in self.nodes if node in base_nodes or node.neighbors]
+
+    def _connect_new_origin(self, origin: Node, new_origins: set):
+        """
+        Does the rotational plane sweep for a Node which is added to an existing visibility graph.
+        :param new_origins: all Nodes which are added at the same time (their sweeps connect them with each other)
+        """
+        y_node = None
+        nodes = self._all_nodes
+        if not self.bus_potential:
+            y_node = origin.get_rotated_on_y_axis(math.degrees(math.asin(self.lisa_speed/self.bus_speed)))
+            nodes = nodes + [y_node]
+        for line in self._rotational_plane_sweep(origin, nodes, self._visible_targets, self._active_edges):
+            line.p2.neighbors.append(origin)
+            if line.p2 is not y_node and line.p2 not in new_origins:
+                origin.neighbors.append(line.p2)  # the old Nodes do not do a sweep again
+            self.vis_graph_lines.add(line)
+        if y_node is not None and y_node.neighbors:
+            self.nodes.append(y_node)
+
+    def _sweep_sequential(self, all_nodes: List[Node], nodes_outside_polygons: List[Node], y_rotation_angle: float,
+                          active_edges: str, y_nodes: bool = True):
+        """
+        Does the rotational plane sweep for every Node in 'nodes_outside_polygons'.
+        :param y_nodes: if False, no Nodes on the y-axis are created and None is returned instead
+        :return: iterator over tuples (origin, y_node, list of the lines to the visible Nodes)
+        """
+        visible_targets = set(nodes_outside_polygons)
+        # the origins are the vertices of one polygon after another, so the angular order changes only a bit
+        sorter = AngularSorter(all_nodes)
+        sort = sorter.sort if self.instrumentation is None else \
+            self.instrumentation.counted(sorter.sort, "angular_sorts", True)
+        for origin in nodes_outside_polygons:
+            # do ROTATIONAL PLANE SWEEP for every node
+            y_node = origin.get_rotated_on_y_axis(y_rotation_angle) if y_nodes else None
+            yield origin, y_node, self._rotational_plane_sweep(origin, sort(origin, y_node), visible_targets,
+                                                               active_edges, presorted=True)
+
+    def _sweep_parallel(self, all_nodes: List[Node], nodes_outside_polygons: List[Node], y_rotation_angle: float,
+                        active_edges: str, workers: int, y_nodes: bool = True):
+        """
+        Does the rotational plane sweeps for 'nodes_outside_polygons' in a process pool. Every process gets a compact
+        copy of the polygons (only the coordinates) and returns the indices of the visible Nodes, so that the results
+        are the same as those of 'WaySearcher._sweep_sequential'.
+        """
+        node_ids = {node: i for i, node in enumerate(all_nodes)}
+        polygons_data = [(polygon.polygon_id, [(point.x, point.y) for point in polygon.points])
+                         for polygon in self.polygons]
+        lisa_position = (self.lisa_node.x, self.lisa_node.y) if self.lisa_node is not None else None
+        origin_ids = [node_ids[origin] for origin in nodes_outside_polygons]
+        chunk_size = max(1, math.ceil(len(origin_ids) / (workers * 4)))
+        chunks = [origin_ids[i:i + chunk_size] for i in range(0, len(origin_ids), chunk_size)]
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_sweep_worker,
+                initargs=(polygons_data, lisa_position, origin_ids, y_rotation_angle, active_edges,
+                          y_nodes, self._reduced)) as executor:
+            for chunk, results in zip(chunks, executor.map(_sweep_worker, chunks)):
+                for origin_id, visible_ids in zip(chunk, results):
+                    origin = all_nodes[origin_id]
+                    y_node = origin.get_rotated_on_y_axis(y_rotation_angle) if y_nodes else None
+                    yield origin, y_node, [LineSegment(origin, y_node if visible_id == -1 else all_nodes[visible_id])
+                                           for visible_id in visible_ids]
+
+    def _rotational_plane_sweep(self, origin: Node, nodes: List[Node], visible_targets, active_edges: str = "set",
+                                presorted: bool = False) -> List[LineSegment]:
+        """
+        Does the rotational plane sweep for 'origin'.
+        :param origin: the Node from which the sweep starts
+        :param nodes: all Nodes to which the visibility is checked (origin may be included)
+        :param visible_targets: set of the Nodes which can be visible at all (Nodes on the y-axis are always possible)
+        :param active_edges: "set" or "tree", see 'create_visibility_graph'
+        :param presorted: Optional. If True, 'nodes' is already sorted by 'angular_sort.sort_by_angle' (or
+        'AngularSorter') and does not contain origin.
+        :return: list of all 'LineSegment's from origin to the visible Nodes
+        """
+        stats = self.instrumentation
+        if not presorted:
+            nodes = sort_by_angle(origin, nodes)  # sort by the angle, if equal, sort by the distance
+            if stats is not None:
+                stats.count("angular_sorts")
+                stats.count("angular_sorts_items", len(nodes))
+        use_tree = active_edges == "tree"
+        # all edges which must be tested with the current point
+        if stats is None:
+            test_edges = ActiveEdges(origin) if use_tree else set()
+            crosses = segment_crosses
+        else:
+            test_edges = TrackedActiveEdges(origin) if use_tree else TrackedSet()
+            crosses = stats.segment_crosses
+        # precalculate test_edges
+        down = LineSegment(origin, Point(origin.x, self._min_y))  # angle = 0° (start)
+        if use_tree:
+            test_edges.ray_point = Point(origin.x, origin.y - 1)
+        edge_array = self.edge_array
+        if stats is not None:
+            stats.count("edge_grid_queries")
+            stats.count("edge_array_crossings" if edge_array.exact and down.exact else "edge_array_intersections")
+        if edge_array.exact and down.exact:
+            # 'down' is vertical, so the intersection lies on an end of the edge if this end has the same x-coordinate
+            hits = ((i, origin.x, edge_array.x1[i] == origin.x, edge_array.x2[i] == origin.x)
+                    for i in edge_array.crossings(down, self.edge_grid.query_indices(down)))
+        else:
+            # the x-ranges of the edges are compared with origin.x directly, because a calculated intersection point
+            # can be rounded out of the range of an edge which ends on 'down'
+            hits = []
+            for i in self.edge_grid.query_indices(down):
+                x1, x2 = edge_array.x1[i], edge_array.x2[i]
+                if x1 == x2 or not (x1 <= origin.x <= x2 or x2 <= origin.x <= x1):
+                    continue  # vertical edges are parallel to 'down' and never intersect it (see 'get_intersection')
+                edge = edge_array.edges[i]
+                if edge.p1 is origin or edge.p2 is origin:
+                    continue
+                y = edge_array.y1[i] + (origin.x - x1) * (edge_array.y2[i] - edge_array.y1[i]) / (x2 - x1)
+                if self._min_y <= y <= origin.y:
+                    hits.append((i, origin.x, x1 == origin.x, x2 == origin.x))
+        for i, x, on_p1, on_p2 in hits:
+            # when there is an intersection, but the intersection lies exactly on one end of the edge, then the
+            # x-coordinate must be greater than the intersection, because only in this case the edge will be
+            # on the counter-clockwise side of the counter-clockwise rotating line and therefore be important.
+            # Otherwise, the edge would cause irritation later (see the documentation for further details).
+            if (not on_p1 or x >= edge_array.x2[i]) and (not on_p2 or x >= edge_array.x1[i]):
+                test_edges.add(edge_array.edges[i])
+        visible_lines = []
+        origin_exact = is_exact(origin)
+        for point in nodes:
+            # check all relevant edges (a 'LineSegment' is only created for the visible Nodes)
+            if point in visible_targets or point.x == 0:
+                exact = origin_exact and is_exact(point)
+                if use_tree:
+                    # only the edges in front of point can hide it (usually the nearest one decides)
+                    if point.x != origin.x or point.y != origin.y:
+                        test_edges.ray_point = point
+                    visible = not any(crosses(edge, origin, point, exact) for edge in test_edges.in_front())
+                else:
+                    visible = not any(crosses(edge, origin, point, exact) for edge in test_edges)
+                if visible and self._reduced:
+                    visible = self._is_tangent(origin, point) and self._is_tangent(point, origin)
+                if visible:
+                    line = LineSegment(origin, point)
+                    if self._is_outside_own_polygon(line):
+                        # point is visible from origin because no edge intersects the line
+                        visible_lines.append(line)
+            if use_tree:
+                # edges of origin never hide anything (they share an end point with every line), but would always be
+                # the nearest ones
+                if point.x != origin.x or point.y != origin.y:  # a Node on the same position as origin does not
+                    test_edges.ray_point = point                # define a direction
+                test_edges.toggle(edge for edge in point.edges if edge.p1 is not origin and edge.p2 is not origin)
+            else:
+                test_edges ^= point.edges  # all edges which are in point.edges and not in
+                                           # test_edges are added, all others removed
+        if stats is not None:
+            stats.record_sweep(len(nodes), test_edges.max_size, len(visible_lines))
+        return visible_lines
+
+    @instrumented_phase("search")
+    def dijkstra(self, engine: str = "heap"):
+        """
+        Searches the way with the latest start time from Lisa's house to the y-axis with the Dijkstra-Algorithm.
+        The search starts at the y-axis Nodes and goes backwards, always choosing the Node with the best (latest) time.
+        :param engine: Optional. "heap" (standard) uses a binary heap with lazy decrease-key and a visited bitset,
+        "list" searches the best Node in a list of all unvisited Nodes (O(V²)), "astar" searches forwards from Lisa's
+        house with A* (see 'WaySearcher._astar').
+        The number of expanded Nodes is stored in 'WaySearcher.expanded_nodes' (None for compact graphs).
+        :return: way (list of Nodes from Lisa's house to the y-axis), length in meters, Lisa's time in seconds
+        """
         if not self.created_vis_graph:
             raise ValueError("Visibility graph must be generated first. ")
+        self.expanded_nodes = None
+        if self.compact_graph is not None:
+            if engine != "heap":
+                raise ValueError("A compact visibility graph can only be searched with the 'heap' engine")
+            self._dijkstra_compact()
+        elif engine == "heap":
+            self._dijkstra_heap()
+        elif engine == "list":
+            self._dijkstra_list()
+        elif engine == "astar":
+            self._astar()
+        else:
+            raise ValueError("Unknown Dijkstra engine '{}'".format(engine))
+        return self._get_way()
+
+    def _dijkstra_list(self):
         unvisited_nodes = self.nodes.copy()
+        self.expanded_nodes = 0
 
         while unvisited_nodes:
             next_node = max(unvisited_nodes, key=lambda n: n.last_time)  # chose the Node with the best (latest) time
@@ -214,37 +829,251 @@ class WaySearcher:
                 # chose Lisa's house, shortest path is found
                 break
             unvisited_nodes.remove(next_node)
-            for neighbor in next_node.neighbors:
+            self.expanded_nodes += 1
+            for neighbor in self._get_neighbors(next_node):
                 if neighbor in unvisited_nodes:  # visited Nodes already contain the best (latest) time
                     neighbor.reload_last_time(next_node, self.lisa_speed)
         else:
             # did not break, Lisa's house can not be reached
             raise ValueError("Lisa's house ('{}') is not reachable".format(self.lisa_node))
-        # did break, so Lisa's house was found and is reachable, so calc the way backwards from self.lisa_node
-        # by adding the parent
+
+    def _dijkstra_heap(self):
+        node_ids = {node: i for i, node in enumerate(self.nodes)}
+        visited = bytearray(len(self.nodes))  # visited bitset, indexed by the position in self.nodes
+        # heapq is a min-heap, so the negative time is used to get the Node with the best (latest) time first.
+        # The Node's index is the tie-breaker so that Nodes never have to be compared.
+        heap = [(-node.last_time, i, node) for i, node in enumerate(self.nodes) if node.last_time != -math.inf]
+        heapq.heapify(heap)
+        self.expanded_nodes = 0
+        while heap:
+            negative_time, i, next_node = heapq.heappop(heap)
+            if visited[i] or -negative_time != next_node.last_time:
+                continue  # outdated entry (lazy decrease-key)
+            if next_node == self.lisa_node:
+                # chose Lisa's house, shortest path is found
+                return
+            visited[i] = 1
+            self.expanded_nodes += 1
+            for neighbor in self._get_neighbors(next_node):
+                neighbor_id = node_ids[neighbor]
+                if not visited[neighbor_id]:  # visited Nodes already contain the best (latest) time
+                    old_time = neighbor.last_time
+                    neighbor.reload_last_time(next_node, self.lisa_speed)
+                    if neighbor.last_time != old_time:
+                        heapq.heappush(heap, (-neighbor.last_time, neighbor_id, neighbor))
+        # heap is empty, Lisa's house can not be reached. As with the "list" engine, the returned way only contains
+        # Lisa's house whose 'last_time' is still -inf.
+
+    def _astar(self):
+        """
+        Searches the way forwards from Lisa's house with A*. A Node is rated by the latest time to leave Lisa's house
+        which is possible on a way through this Node: the way to the Node is known, from the Node Lisa can at best run
+        directly to the bus ('WaySearcher._get_bus_bound', ignoring all obstacles). This bound never underestimates and
+        changes at most by the distance divided by Lisa's speed between two Nodes, so the first way which reaches the
+        bus is the best one.
+        A way ends at a Node on the y-axis, or, with 'bus_potential', at every Node whose direct line to the bus is free.
+        Afterwards, 'last_time' and 'parent' are set for the Nodes on the way like after the Dijkstra-Algorithm.
+        """
+        # times when the bus is reached from the Nodes where a way can end ('last_time' before the search)
+        end_times = {node: node.last_time for node in self.nodes if node.last_time != -math.inf}
+        # the sweeps only connect the Nodes on the y-axis backwards with their origins
+        y_nodes = {}
+        for node in self.nodes:
+            if node.polygon is None and node is not self.lisa_node:
+                for origin in node.neighbors:
+                    y_nodes.setdefault(origin, []).append(node)
+        bounds = {}
+
+        def rate(node, distance):
+            if node not in bounds:
+                bounds[node] = self._get_bus_bound(node)
+            return bounds[node] - distance / self.lisa_speed
+
+        distances = {self.lisa_node: 0}
+        previous = {self.lisa_node: None}
+        closed = set()
+        counter = itertools.count()  # tie-breaker, so that Nodes are never compared
+        # entries: (negative rating, counter, Node, True if the way ends at this Node)
+        heap = [(-rate(self.lisa_node, 0), next(counter), self.lisa_node, False)]
+        self.expanded_nodes = 0
+        end = None
+        while heap:
+            _, _, node, is_end = heapq.heappop(heap)
+            if is_end:
+                end = node
+                break
+            if node in closed:
+                continue  # outdated entry (lazy decrease-key)
+            closed.add(node)
+            self.expanded_nodes += 1
+            distance = distances[node]
+            if node in end_times:
+                heapq.heappush(heap, (-(end_times[node] - distance / self.lisa_speed), next(counter), node, True))
+            for neighbor in itertools.chain(self._get_neighbors(node), y_nodes.get(node, ())):
+                if neighbor in closed:
+                    continue
+                new_distance = distance + node.get_distance(neighbor)
+                if new_distance < distances.get(neighbor, math.inf):
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (-rate(neighbor, new_distance), next(counter), neighbor, False))
+        if end is None:
+            return  # Lisa's house can not be reached, its 'last_time' stays -inf
+        # set the times backwards from the end of the way, exactly like the Dijkstra-Algorithm does
+        node = end
+        node.last_time = end_times[end]
+        while previous[node] is not None:
+            previous[node].parent = node
+            previous[node].last_time = node.last_time - previous[node].get_distance(node) / self.lisa_speed
+            node = previous[node]
+
+    def _dijkstra_compact(self):
+        lisa_id = self.nodes.index(self.lisa_node)
+        times, parents = self.compact_graph.dijkstra(lisa_id, self.lisa_speed)
+        # the Nodes are only a view of the compact graph, so the result is copied to the Nodes on the way
+        way_ids = get_way_ids(parents, lisa_id)
+        for node_id, parent_id in zip(way_ids, way_ids[1:] + [-1]):
+            node = self.nodes[node_id]
+            node.last_time = times[node_id]
+            node.parent = self.nodes[parent_id] if parent_id != -1 else None
+
+    def _get_neighbors(self, node: Node) -> List[Node]:
+        """
+        Returns all Nodes which are visible from 'node'. If the visibility graph is created lazily, the rotational plane
+        sweep for 'node' is done the first time and its result is stored in 'node.neighbors'.
+        """
+        if self.lazy and not node.swept:
+            for line in self._rotational_plane_sweep(node, self._all_nodes, self._visible_targets, self._active_edges):
+                node.neighbors.append(line.p2)
+                self.vis_graph_lines.add(line)
+            node.swept = True
+        return node.neighbors
+
+    @staticmethod
+    def _is_tangent(node: Node, other: Node) -> bool:
+        """
+        Returns True if the line from 'node' to 'other' is tangent to the polygon of 'node', i.e. both neighbors of
+        'node' in its polygon lie on the same side of the line (or on it). A shortest way can only pass a vertex on
+        lines which are tangent there. Nodes without polygon (Lisa's house, Nodes on the y-axis) are always tangent.
+        """
+        if len(node.polygon_neighbors) != 2:
+            return True
+        previous, following = node.polygon_neighbors
+        side1 = orientation(node, other, previous)
+        side2 = orientation(node, other, following)
+        return not ((side1 > 0 and side2 < 0) or (side1 < 0 and side2 > 0))
+
+    def _is_outside_own_polygon(self, line: LineSegment) -> bool:
+        """
+        Returns False if both ends of 'line' belong to the same polygon and the line goes through this polygon.
+        """
+        if line.p1.polygon_id != line.p2.polygon_id or line.p1.polygon is None or line.p2.polygon is None or \
+                line.p2 in line.p1.polygon_neighbors:
+            return True
+        if self.instrumentation is not None:
+            self.instrumentation.count("midpoint_in_polygon")
+        return not line.p1.polygon.midpoint_in_polygon(line.p1, line.p2)
+
+    def _is_line_free(self, line: LineSegment) -> bool:
+        """
+        Returns True if no obstacle edge intersects 'line'.
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.count("edge_grid_queries")
+            self.instrumentation.count("edge_array_crossings")
+        return not self.edge_array.crossings(line, self.edge_grid.query_indices(line))
+
+    def get_bus_node(self, node: Node) -> Node:
+        """
+        Creates the Node on the y-axis where Lisa meets the bus if she runs directly from 'node' to the bus.
+        Its 'last_time' is the time when the bus arrives there.
+        """
+        bus_node = node.get_rotated_on_y_axis(math.degrees(math.asin(self.lisa_speed/self.bus_speed)))
+        bus_node.last_time = bus_node.y / self.bus_speed
+        return bus_node
+
+    def _get_bus_bound(self, node: Node) -> float:
+        """
+        Calculates the latest time to leave 'node' if Lisa runs directly to the bus and there were no obstacles. This is
+        an upper bound for every way from 'node'.
+        """
+        bus_node = self.get_bus_node(node)
+        return bus_node.last_time - node.get_distance(bus_node) / self.lisa_speed
+
+    def _get_bus_potential(self, node: Node) -> float:
+        """
+        Calculates the latest time to leave 'node' if Lisa runs directly to the bus, or -inf if the way is blocked.
+        """
+        bus_node = self.get_bus_node(node)
+        line = LineSegment(node, bus_node)
+        if not self._is_line_free(line):
+            return -math.inf
+        return bus_node.last_time - line.length / self.lisa_speed
+
+    def _get_way(self):
+        # Lisa's house was found and is reachable, so calc the way backwards from self.lisa_node by adding the parent
         way_points = []
         node = self.lisa_node
         length = 0
         while node is not None:
+            if node.parent is None and self.bus_potential and node.last_time != -math.inf and node.x != 0:
+                # the way ends with the direct line to the bus, whose Node was not created before
+                node.parent = self.get_bus_node(node)
             way_points.append(node)
             if node.parent:
                 length += node.get_distance(node.parent)
             node = node.parent
         return way_points, length, length/self.lisa_speed  # all points, length in meters, Lisa's time
 
+# state of a process of 'WaySearcher._sweep_parallel', set by '_init_sweep_worker'
+_worker_searcher = None
+_worker_targets = None
+_worker_settings = None
+
+
+def _init_sweep_worker(polygons_data, lisa_position, visible_target_ids, y_rotation_angle, active_edges, y_nodes,
+                       reduced):
+    global _worker_searcher, _worker_targets, _worker_settings
+    polygons = [Polygon([Node(x, y) for x, y in points], polygon_id) for polygon_id, points in polygons_data]
+    lisa_node = Node(lisa_position[0], lisa_position[1], polygon_id="L") if lisa_position is not None else None
+    _worker_searcher = WaySearcher(polygons, lisa_node)
+    _worker_searcher._reduced = reduced
+    _worker_targets = set(_worker_searcher.nodes[i] for i in visible_target_ids)
+    _worker_settings = (y_rotation_angle, active_edges, y_nodes)
+
+
+def _sweep_worker(origin_ids: List[int]) -> List[List[int]]:
+    """
+    Does the rotational plane sweep for every given Node index.
+    :return: for every origin the indices of the visible Nodes, -1 stands for the Node on the y-axis
+    """
+    y_rotation_angle, active_edges, y_nodes = _worker_settings
+    nodes = _worker_searcher.nodes
+    node_ids = {node: i for i, node in enumerate(nodes)}
+    sorter = AngularSorter(nodes)
+    results = []
+    for origin_id in origin_ids:
+        origin = nodes[origin_id]
+        y_node = origin.get_rotated_on_y_axis(y_rotation_angle) if y_nodes else None
+        lines = _worker_searcher._rotational_plane_sweep(origin, sorter.sort(origin, y_node), _worker_targets,
+                                                         active_edges, presorted=True)
+        results.append([-1 if line.p2 is y_node else node_ids[line.p2] for line in lines])
+    return results
+
 
 if __name__ == "__main__":
     import sys
     import time
     import datetime
     
-    assert len(sys.argv) == 3
+    assert len(sys.argv) in (3, 4)  # way_searcher.py SOURCE DESTINATION [CACHE_DIRECTORY]
     src = sys.argv[1]
     dst = sys.argv[2]
+    cache = sys.argv[3] if len(sys.argv) == 4 else None
     with open(src, "r") as f:
         searcher = WaySearcher.from_str(f.read())
     t1_vis = time.perf_counter()
-    searcher.create_visibility_graph()
+    searcher.create_visibility_graph(cache_dir=cache)
     t2_vis = time.perf_counter()
     t1_dij = time.perf_counter()
     way, way_length, way_time = searcher.dijkstra()